@@ -0,0 +1,187 @@
+import random
+from collections import Counter
+from typing import Dict, List, Tuple
+
+from grafos import RedFlujo, hopcroft_karp
+from indices import IndiceOcupacion
+from metodo_constructivo import DIA, repartir_zonas
+
+
+# =========================
+# Asientos por emparejamiento
+# =========================
+def _sentar_por_gustos(emps: List[str],
+                       zona_emp: Dict[str, str],
+                       desks_e: Dict[str, List[str]],
+                       desks_z: Dict[str, List[str]],
+                       zones_order: Tuple[str, ...],
+                       zone_of: Dict[str, str],
+                       rng=None) -> Dict[str, str]:
+    """
+    Emparejamiento máximo con los gustos dentro de la zona de cada uno, aumentado luego
+    con todos sus gustos (los ya sentados en un gusto no lo pierden). Quien queda sin
+    escritorio preferido va a uno libre de su zona, o de cualquier zona.
+    """
+    desks = [d for z in zones_order for d in desks_z[z]]
+    desk_id = {d: i for i, d in enumerate(desks)}
+    gustos = []
+    for e in emps:
+        ls = [desk_id[d] for d in dict.fromkeys(desks_e.get(e, []) or []) if d in desk_id]
+        if rng:
+            rng.shuffle(ls)
+        gustos.append(ls)
+    en_zona = [[v for v in ls if zone_of[desks[v]] == zona_emp.get(e)] for e, ls in zip(emps, gustos)]
+
+    _, match_l, match_r = hopcroft_karp(en_zona, len(desks))
+    hopcroft_karp(gustos, len(desks), match_l, match_r)
+
+    libres = IndiceOcupacion(desks_z, [DIA])
+    assignment: Dict[str, str] = {}
+    for u, v in enumerate(match_l):
+        if v != -1:
+            assignment[emps[u]] = desks[v]
+            libres.ocupar(DIA, desks[v])
+
+    for u, e in enumerate(emps):
+        if match_l[u] != -1:
+            continue
+        z = zona_emp.get(e)
+        chosen = libres.primero_libre(DIA, z) if z is not None else None
+        if chosen is None:
+            z = next((zz for zz in zones_order if libres.n_libres(DIA, zz)), None)
+            chosen = libres.primero_libre(DIA, z) if z is not None else None
+        if chosen is None:
+            continue   # sin sillas globales
+        assignment[e] = chosen
+        libres.ocupar(DIA, chosen)
+
+    return assignment
+
+
+def seat_day_matching(employees_day: List[str],
+                      desks_e: Dict[str, List[str]],
+                      desks_z: Dict[str, List[str]],
+                      employee_group,                 # dict o callable emp->grupo
+                      zones_order: Tuple[str, ...],
+                      zone_of: Dict[str, str],
+                      seed: int = None) -> Dict[str, str]:
+    """
+    Misma firma que seat_day_constructive. Minimiza las asignaciones inválidas del día
+    con un emparejamiento máximo empleado->escritorio sobre Desks_E.
+    La zona objetivo (repartir_zonas) queda como objetivo secundario: primero se
+    empareja con los gustos dentro de la zona objetivo y luego se aumenta con todos
+    los gustos. Quien no alcanza escritorio preferido va a uno libre de su zona
+    (o de cualquier zona).
+    seed: si se da, baraja empleados y gustos (mismo número de inválidas, otra solución);
+    así también sirve como seat_fn de crear_solucion_random.
+    """
+    rng = random.Random(seed) if seed is not None else None
+    target = repartir_zonas(employees_day, desks_z, employee_group, zones_order)
+
+    emps = list(employees_day)
+    if rng:
+        rng.shuffle(emps)
+    return _sentar_por_gustos(emps, target, desks_e, desks_z, zones_order, zone_of, rng)
+
+
+# =========================
+# Asientos por flujo de costo mínimo
+# =========================
+def seat_day_flow(employees_day: List[str],
+                  desks_e: Dict[str, List[str]],
+                  desks_z: Dict[str, List[str]],
+                  employee_group,                 # dict o callable emp->grupo
+                  zones_order: Tuple[str, ...],
+                  zone_of: Dict[str, str],
+                  seed: int = None) -> Dict[str, str]:
+    """
+    Misma firma que seat_day_constructive. Decide zonas y escritorios juntos:
+
+    1) Red del día: fuente -> tipo -> cupo (grupo, zona) -> zona -> sumidero, con un
+       tipo por (grupo, zonas con escritorios que le gustan) y capacidad = cuántos son.
+       Los cupos tienen la capacidad del reparto en bloques de repartir_zonas (sin
+       singletons); salir de ese reparto cuesta 1 (posible aislado) y sentar a alguien
+       en una zona sin escritorios que le gusten cuesta W > #empleados, así que el
+       flujo de costo mínimo respeta la prioridad (inválidas, aislados). Los costos
+       son pocos (0, 1, W), así que RedFlujo resuelve en pocas fases.
+    2) Dentro de cada zona, emparejamiento máximo con los escritorios preferidos;
+       luego se aumenta con todos los gustos del día (nunca empeora las inválidas)
+       y el resto va a un escritorio libre de su zona.
+
+    Es una descomposición: que un empleado tenga gustos en la zona no garantiza
+    que queden libres, y los aislados no son lineales, por lo que el problema exacto
+    no es un flujo puro; el paso 2 deja las inválidas en el mínimo del día.
+    seed: si se da, baraja empleados y gustos (para usarlo en crear_solucion_random).
+    """
+    rng = random.Random(seed) if seed is not None else None
+
+    def grp(e):
+        return employee_group[e] if isinstance(employee_group, dict) else employee_group(e)
+
+    emps = list(employees_day)
+    if rng:
+        rng.shuffle(emps)
+    n_e, n_z = len(emps), len(zones_order)
+    zone_pos = {z: i for i, z in enumerate(zones_order)}
+
+    plan = Counter((grp(e), z) for e, z in repartir_zonas(employees_day, desks_z, employee_group,
+                                                          zones_order).items())
+    slots = {gz: i for i, gz in enumerate(sorted(plan, key=lambda gz: (str(gz[0]), zone_pos[gz[1]])))}
+    zonas_de = {}
+    for g, z in slots:
+        zonas_de.setdefault(g, []).append(z)
+
+    # tipos: empleados intercambiables para el flujo (orden de emps dentro de cada tipo)
+    tipos: Dict[Tuple, List[str]] = {}
+    for e in emps:
+        zonas_gusto = frozenset(zone_of[d] for d in desks_e.get(e, []) or [] if zone_of.get(d) in zone_pos)
+        tipos.setdefault((grp(e), zonas_gusto), []).append(e)
+    lista_tipos = list(tipos.items())
+
+    # nodos: fuente, sumidero, tipos, cupos, zonas
+    S, T = 0, 1
+    base_slot = 2 + len(lista_tipos)
+    base_zona = base_slot + len(slots)
+    red = RedFlujo(base_zona + n_z)
+    W = n_e + 1
+
+    for z, i in zone_pos.items():
+        red.arco(base_zona + i, T, len(desks_z[z]), 0)
+    for (g, z), i in slots.items():
+        red.arco(base_slot + i, base_zona + zone_pos[z], plan[g, z], 0)
+
+    refs = []
+    for k, ((g, zonas_gusto), miembros) in enumerate(lista_tipos):
+        n = len(miembros)
+        red.arco(S, 2 + k, n, 0)
+        arcos = []
+        for z in zonas_de.get(g, []):
+            c = 0 if z in zonas_gusto else W
+            arcos.append((z, red.arco(2 + k, base_slot + slots[g, z], n, c)))
+        for z in sorted(zonas_gusto - set(zonas_de.get(g, [])), key=zone_pos.get):
+            arcos.append((z, red.arco(2 + k, base_zona + zone_pos[z], n, 1)))
+        refs.append(arcos)
+    red.flujo(S, T)
+
+    # dentro de un tipo, cada cupo de zona va a quien más escritorios le gustan ahí
+    zona_emp = {}
+    for (_, miembros), arcos in zip(lista_tipos, refs):
+        cupo = Counter()
+        for z, ref in arcos:
+            cupo[z] += red.flujo_en(ref)
+        if len(cupo) == 1 or len(miembros) == 1:
+            pendientes = iter(miembros)
+            for z, n in cupo.items():
+                for _ in range(n):
+                    zona_emp[next(pendientes)] = z
+            continue
+        gustos_en = {e: Counter(zone_of[d] for d in desks_e.get(e, []) or [] if zone_of.get(d) in zone_pos)
+                     for e in miembros}
+        pares = sorted(((-gustos_en[e][z], i, z, e) for i, e in enumerate(miembros) for z in cupo if cupo[z]))
+        for _, _, z, e in pares:
+            if cupo[z] and e not in zona_emp:
+                zona_emp[e] = z
+                cupo[z] -= 1
+
+    # 2) escritorios: primero dentro de la zona elegida, luego con todos los gustos
+    return _sentar_por_gustos(emps, zona_emp, desks_e, desks_z, zones_order, zone_of, rng)
@@ -0,0 +1,191 @@
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from typing import Dict, List
+
+from instancia import como_instancia
+from score import evaluate_solution, contadores
+from generar_instancias import generar_instancia
+
+METODOS = ["constructive", "constructive_matching", "constructive_flow", "randomized", "grasp", "annealing", "annealing_adaptive", "vns", "local_search_best", "local_search_first", "local_search_extended"]
+
+
+# ======================================================
+# EJECUCIÓN DE UN MÉTODO
+# ======================================================
+
+def ejecutar_metodo(metodo: str, ci, seed: int):
+    """Corre un método sobre la instancia compilada y devuelve (solución, puntaje)."""
+    from metodo_constructivo import generar_solucion
+    from metodo_constructivo_aleatorio import randomized_solution
+    from metodo_aleatorio import simulated_annealing_assignments
+    from metodo_vns import vns_assignments
+    from busqueda_local import local_search
+    from asientos import seat_day_matching, seat_day_flow
+    from grasp import grasp_assignments
+
+    random.seed(seed)   # SA y VNS usan el generador global
+    if metodo == "constructive":
+        sol, _ = generar_solucion(ci)
+    elif metodo == "constructive_matching":
+        sol, _ = generar_solucion(ci, seat_fn=seat_day_matching)
+    elif metodo == "constructive_flow":
+        sol, _ = generar_solucion(ci, seat_fn=seat_day_flow)
+    elif metodo == "randomized":
+        sol, _ = randomized_solution(ci, seed=seed)
+    elif metodo == "grasp":
+        sol, _, _ = grasp_assignments(ci, tiempo_s=None, max_inicios=20, seed=seed)   # reproducible
+    elif metodo == "annealing":
+        base, groups_days = generar_solucion(ci)
+        sol, _, _ = simulated_annealing_assignments(base, groups_days, ci)
+    elif metodo == "annealing_adaptive":
+        base, groups_days = generar_solucion(ci)
+        sol, _, _ = simulated_annealing_assignments(base, groups_days, ci, iterations=20000, T_init=None,
+                                                    seed=seed, enfriamiento="adaptativo")   # reproducible
+    elif metodo == "vns":
+        base, groups_days = generar_solucion(ci)
+        sol, _, _ = vns_assignments(base, groups_days, ci)
+    elif metodo == "local_search_best":
+        sol, _ = local_search(None, ci, tipo="best")
+    elif metodo == "local_search_first":
+        sol, _ = local_search(None, ci, tipo="first")
+    elif metodo == "local_search_extended":
+        sol, _ = local_search(None, ci, tipo="first", ampliada=True)
+    else:
+        raise ValueError(f"Método desconocido: {metodo}")
+    return sol, evaluate_solution(sol, ci)
+
+
+def medir(metodo: str, ci, seeds: List[int], medir_memoria: bool = True) -> Dict:
+    """Repite el método con cada semilla; la memoria pico se mide en una corrida extra con tracemalloc."""
+    tiempos, evaluaciones, movimientos, puntajes = [], [], [], []
+    for seed in seeds:
+        contadores.clear()
+        with contextlib.redirect_stdout(io.StringIO()):
+            t0 = time.perf_counter()
+            _, score = ejecutar_metodo(metodo, ci, seed)
+            elapsed = time.perf_counter() - t0
+        tiempos.append(elapsed)
+        evaluaciones.append(contadores["evaluaciones"])
+        movimientos.append(contadores["movimientos"])
+        puntajes.append(list(score))
+
+    peak_mb = None
+    if medir_memoria:
+        tracemalloc.start()
+        with contextlib.redirect_stdout(io.StringIO()):
+            ejecutar_metodo(metodo, ci, seeds[0])
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        peak_mb = peak / 2**20
+
+    total = sum(tiempos)
+    return {
+        "method": metodo,
+        "trials": len(seeds),
+        "seeds": seeds,
+        "time_s": tiempos,
+        "time_mean_s": statistics.mean(tiempos),
+        "time_min_s": min(tiempos),
+        "evaluations": evaluaciones,
+        "evals_per_s": sum(evaluaciones) / total if total > 0 else None,
+        "moves": movimientos,
+        "moves_per_s": sum(movimientos) / total if total > 0 else None,
+        "peak_mem_mb": peak_mb,
+        "scores": puntajes,
+        "best_score": min(puntajes),
+    }
+
+
+# ======================================================
+# INSTANCIAS
+# ======================================================
+
+def instancias_benchmark(incluidas: List[str], generadas: List[int], seed: int):
+    """Devuelve [(nombre, CompiledInstance)]: las de instances/ pedidas más las sintéticas."""
+    out = []
+    for path in incluidas:
+        out.append((os.path.splitext(os.path.basename(path))[0], como_instancia(path)))
+    for n in generadas:
+        inst = generar_instancia(
+            n_empleados=n,
+            n_zonas=max(2, round(0.15 * n)),
+            n_grupos=max(1, round(0.18 * n)),
+            densidad_escritorios=min(0.66, 30 / max(1, round(0.45 * n))),
+            seed=seed,
+        )
+        out.append((f"generated_{n}_s{seed}", como_instancia(inst)))
+    return out
+
+
+def commit_actual():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def correr_benchmark(incluidas, generadas, metodos, repeticiones=3, seed=0, medir_memoria=True) -> Dict:
+    seeds = [seed + i for i in range(repeticiones)]
+    resultados = []
+    for nombre, ci in instancias_benchmark(incluidas, generadas, seed):
+        for metodo in metodos:
+            r = medir(metodo, ci, seeds, medir_memoria=medir_memoria)
+            r.update({
+                "instance": nombre,
+                "n_employees": ci.n_employees,
+                "n_desks": ci.n_desks,
+                "n_zones": ci.n_zones,
+                "n_groups": ci.n_groups,
+            })
+            resultados.append(r)
+            print(f"{nombre:>22} {metodo:>20}  {r['time_mean_s']:9.4f}s  "
+                  f"evals/s={r['evals_per_s'] or 0:11.1f}  best={tuple(r['best_score'])}")
+    return {
+        "meta": {
+            "commit": commit_actual(),
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "repetitions": repeticiones,
+            "seed": seed,
+        },
+        "results": resultados,
+    }
+
+
+# ======================================================
+# MAIN
+# ======================================================
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark de todos los métodos sobre instancias incluidas y generadas.")
+    parser.add_argument("--instancias", nargs="*", default=[f"instances/instance{i}.json" for i in range(1, 11)])
+    parser.add_argument("--generadas", nargs="*", type=int, default=[], help="tamaños (empleados) de instancias sintéticas")
+    parser.add_argument("--metodos", nargs="*", default=METODOS, choices=METODOS)
+    parser.add_argument("--repeticiones", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--sin-memoria", action="store_true", help="no medir memoria pico (evita la corrida extra)")
+    parser.add_argument("-o", "--salida", default="bench_output.json")
+    args = parser.parse_args(argv)
+
+    reporte = correr_benchmark(args.instancias, args.generadas, args.metodos,
+                               repeticiones=args.repeticiones, seed=args.seed,
+                               medir_memoria=not args.sin_memoria)
+    with open(args.salida, "w", encoding="utf-8") as f:
+        json.dump(reporte, f, indent=2)
+    print(f"\n✅ Resultados guardados en {args.salida}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,26 +1,46 @@
 import copy
-from score import evaluate_solution
+from collections import deque
+
+from score import evaluate_solution, contadores
 from metodo_constructivo import generar_solucion_desde_archivo as generar_solucion
-from metodo_constructivo_aleatorio import randomized_solution_desde_archivo as generar_solucion_aleatoria
-from metodo_constructivo import build_employee_to_group
-import json
+from instancia import como_instancia
+from metodo_constructivo_aleatorio import _precalculo
+from indices import IndiceOcupacion, IndiceEmpleados
+from evaluacion_incremental import EvaluadorIncremental, sumar_delta
+from solucion_array import LIBRE, SolucionArray
+
+
+def primer_libre_del_dia(indice, desks_z, day):
+    """(zona, escritorio) del primer escritorio libre del día recorriendo Desks_Z en orden, o None."""
+    for zone in desks_z:
+        desk = indice.primero_libre(day, zone)
+        if desk is not None:
+            return zone, desk
+    return None
 
 
-def mover_empleado_de_dia(sol, day_from, zone_from, idx_emp, day_to, desks_z, employee_group, groups_days):
+def mover_empleado_de_dia(sol, day_from, zone_from, idx_emp, day_to, desks_z, employee_group, groups_days,
+                          indice=None, empleados=None):
     """
     Mueve un empleado de un día a otro (vecindario general).
         No se permite mover a alguien fuera del día de su grupo.
         Se requiere capacidad en el nuevo día.
         Se conserva el requisito de al menos dos días por empleado (después del movimiento).
+    El movimiento se hace en sitio, sin copiar la solución.
+    indice: IndiceOcupacion de sol; si se pasa, se actualiza cuando el movimiento se hace.
+    empleados: IndiceEmpleados de sol; si se pasa, los días del empleado salen de él en O(1)
+    y el movimiento se hace a través de él, así que queda sincronizado.
     """
+    contadores["movimientos"] += 1
     desk_from, emp = sol[day_from][zone_from][idx_emp]
     grupo = employee_group[emp]
 
     if day_from == groups_days.get(grupo):
         return False
 
-    # Contar los días actuales del empleado
-    days_assigned = [d for d in sol if any(emp == e for zonas in sol[d].values() for _, e in zonas)]
+    # Días actuales del empleado
+    ubicador = empleados if empleados is not None else IndiceEmpleados.desde_solucion(sol)
+    days_assigned = ubicador.dias(emp)
 
     if len(days_assigned) <= 1:
         return False
@@ -29,104 +49,390 @@ def mover_empleado_de_dia(sol, day_from, zone_from, idx_emp, day_to, desks_z, em
         return False
 
     # Buscar escritorio libre en el día destino
-    ocupados = [desk for zonas in sol[day_to].values() for desk, _ in zonas]
-    for zone_dest, desks in desks_z.items():
-        libres = [d for d in desks if d not in ocupados]
-        if not libres:
-            continue
-
-        # Simular movimiento
-        nueva_sol = copy.deepcopy(sol)
-        nueva_sol[day_from][zone_from].pop(idx_emp)
-        nueva_sol[day_to][zone_dest].append((libres[0], emp))
-
-        # Verificar que el empleado siga teniendo ≥ 2 días después del movimiento
-        new_days = [
-            d for d in nueva_sol if any(emp == e for zonas in nueva_sol[d].values() for _, e in zonas)
-        ]
-        if len(new_days) == 2:
-            # Movimiento válido
-            sol[day_from][zone_from].pop(idx_emp)
-            sol[day_to][zone_dest].append((libres[0], emp))
-            return True
-
-    return False
-
-
-def local_search(instance_path, instance, tipo="best"):
+    propio = indice is None
+    if propio:
+        indice = IndiceOcupacion.desde_solucion(desks_z, {day_to: sol[day_to]})
+    destino = primer_libre_del_dia(indice, desks_z, day_to)
+    if destino is None:
+        return False
+
+    # El empleado debe quedar con exactamente 2 días después del movimiento
+    # (sigue en day_from si aparecía más de una vez ese día)
+    if len(days_assigned) + 1 - (ubicador.apariciones(emp, day_from) == 1) != 2:
+        return False
+
+    zone_dest, desk_to = destino
+    if empleados is not None:
+        empleados.quitar(sol, day_from, zone_from, idx_emp)
+        empleados.agregar(sol, day_to, zone_dest, desk_to, emp)
+    else:
+        sol[day_from][zone_from].pop(idx_emp)
+        sol[day_to][zone_dest].append((desk_to, emp))
+    if not propio:
+        indice.ocupar(day_to, desk_to)
+        indice.liberar(day_from, desk_from)
+    return True
+
+
+def explorar_vecindario(sol, valor_actual, ci, groups_days, indice, ev, empleados, tipo="best", rango=None):
+    """
+    Recorre los vecinos (d_from, z_from, idx, d_to) de sol en el mismo orden que la
+    versión con copias y los evalúa con el delta de ev, sin tocar sol.
+    Devuelve (valor, d_from, z_from, idx, d_to) del mejor vecino que mejora (el
+    primero con tipo="first"; ante empates, el primero encontrado), o None.
+    rango: (inicio, fin) sobre las asignaciones en orden de recorrido; solo se
+    mueven las de esas posiciones (para repartir el vecindario entre procesos).
+    """
+    employee_group = ci.emp_to_group
+    day_idx, desk_idx, emp_idx = ci.day_idx, ci.desk_idx, ci.emp_idx
+    days = list(sol.keys())
+    n_destinos = len(days) - 1
+
+    # el destino de un día no depende de a quién se mueva: primer libre en orden de Desks_Z
+    destinos = {}
+    for d_to in days:
+        destino = primer_libre_del_dia(indice, ci.desks_z, d_to)
+        if destino is not None:
+            destinos[d_to] = (day_idx[d_to], desk_idx[destino[1]])
+
+    inicio, fin = rango if rango is not None else (0, float("inf"))
+    pos = -1
+    mejor = None
+    mejor_valor = valor_actual
+    for d_from in days:
+        t_from = day_idx[d_from]
+        for z_from, lista in sol[d_from].items():
+            if pos + len(lista) < inicio:
+                pos += len(lista)
+                continue
+            for idx, (desk_from, emp) in enumerate(lista):
+                pos += 1
+                if pos < inicio:
+                    continue
+                if pos >= fin:
+                    return mejor
+                contadores["movimientos"] += n_destinos
+                if d_from == groups_days.get(employee_group[emp]):
+                    continue
+                dias = empleados.dias(emp)
+                if len(dias) <= 1 or len(dias) + 1 - (empleados.apariciones(emp, d_from) == 1) != 2:
+                    continue
+                e, d0 = emp_idx[emp], desk_idx[desk_from]
+                for d_to in days:
+                    if d_to == d_from or d_to in dias or d_to not in destinos:
+                        continue
+                    t_to, d1 = destinos[d_to]
+                    val_vecina = sumar_delta(valor_actual, ev.delta_mover(e, t_from, d0, t_to, d1))
+                    if val_vecina < mejor_valor:
+                        mejor_valor = val_vecina
+                        mejor = (val_vecina, d_from, z_from, idx, d_to)
+                        if tipo == "first":
+                            return mejor
+    return mejor
+
+
+def aplicar_movimiento(sol, ci, groups_days, indice, ev, empleados, movimiento):
+    """Aplica en sitio un movimiento devuelto por explorar_vecindario (solución, índices y evaluador)."""
+    _, d_from, z_from, idx, d_to = movimiento
+    desk_from, emp = sol[d_from][z_from][idx]
+    _, desk_to = primer_libre_del_dia(indice, ci.desks_z, d_to)
+    mover_empleado_de_dia(sol, d_from, z_from, idx, d_to, ci.desks_z, ci.emp_to_group, groups_days,
+                          indice, empleados)
+    ev.aplicar((ev.a_ids(d_from, desk_from, emp),), (ev.a_ids(d_to, desk_to, emp),))
+
+
+# =====================================================
+# Exploración en paralelo (best-improvement)
+# =====================================================
+# Cada proceso guarda una réplica del estado de la búsqueda (instancia compilada de
+# solo lectura + solución, índices de libres y de empleados, y evaluador) y la pone al día
+# reproduciendo los movimientos que le faltan antes de explorar su tramo. Cada tarea lleva
+# solo los movimientos desde la iteración anterior; un proceso que se saltó iteraciones
+# (el pool no reparte una tarea por proceso) lo avisa y recibe el tramo que le falta.
+_ESTADO_BUSQUEDA = {}
+
+def _iniciar_proceso_busqueda(raw, sol, groups_days):
+    ci = como_instancia(raw)
+    _ESTADO_BUSQUEDA.clear()
+    _ESTADO_BUSQUEDA.update(
+        ci=ci, sol=sol, groups_days=groups_days,
+        indice=IndiceOcupacion.desde_solucion(ci.desks_z, sol),
+        ev=EvaluadorIncremental.desde_solucion(ci, sol),
+        empleados=IndiceEmpleados.desde_solucion(sol), aplicados=0,
+    )
+
+def _explorar_en_proceso(desde, nuevos, valor_actual, inicio, fin):
+    """
+    nuevos = historial[desde:]. Devuelve (True, mejor vecino del tramo) o, si al proceso
+    le faltan movimientos anteriores a desde, (False, cuántos tiene aplicados).
+    """
+    st = _ESTADO_BUSQUEDA
+    if st["aplicados"] < desde:
+        return False, st["aplicados"]
+    for movimiento in nuevos[st["aplicados"] - desde:]:
+        aplicar_movimiento(st["sol"], st["ci"], st["groups_days"], st["indice"], st["ev"], st["empleados"],
+                           movimiento)
+    st["aplicados"] = desde + len(nuevos)
+    return True, explorar_vecindario(st["sol"], valor_actual, st["ci"], st["groups_days"], st["indice"],
+                                     st["ev"], st["empleados"], "best", (inicio, fin))
+
+
+def _explorar_tramos(pool, historial, desde, valor_actual, cortes):
+    """Mejor vecino de cada tramo; reenvía el sufijo del historial a los procesos atrasados."""
+    n = len(cortes) - 1
+    nuevos = historial[desde:]
+    futuros = {k: pool.submit(_explorar_en_proceso, desde, nuevos, valor_actual, cortes[k], cortes[k + 1])
+               for k in range(n)}
+    tramos = {}
+    while futuros:
+        pendientes = {}
+        for k, fut in futuros.items():
+            listo, dato = fut.result()
+            if listo:
+                tramos[k] = dato
+            else:
+                pendientes[k] = pool.submit(_explorar_en_proceso, dato, historial[dato:], valor_actual,
+                                            cortes[k], cortes[k + 1])
+        futuros = pendientes
+    return [tramos[k] for k in range(n)]
+
+
+def local_search(instance_path, instance, tipo="best", workers=None, ampliada=False, inicial=None):
     """
     Búsqueda local con vecindario general:
         Permite mover empleados entre días (excepto su día de grupo).
         Conserva mínimo dos días por empleado.
         Cumple las restricciones estructurales.
+    La solución se modifica en sitio: cada vecino se evalúa con el delta del
+    EvaluadorIncremental y solo el movimiento elegido se aplica (a la solución, al
+    índice de libres, al índice inverso de empleados y al evaluador). El resultado es el
+    mismo que con copias y evaluate_solution completo.
+    workers: con tipo="best" y workers > 1, cada iteración reparte las asignaciones
+    en tramos contiguos entre procesos; cada uno devuelve su mejor vecino y se elige
+    el mínimo por (valor, tramo), que es el mismo vecino que encuentra el recorrido
+    secuencial. Conviene solo en instancias grandes.
+    ampliada: al converger, sigue con busqueda_local_ampliada (intercambios,
+    reasignación de escritorio y cadenas de expulsión) desde el óptimo local.
+    inicial: (solución, groups_days) de partida ya calculada (None -> constructivo);
+    se copia, así que quien la pasa la conserva intacta.
     """
-    sol_actual, groups_days = generar_solucion(instance_path)
-    employee_group = build_employee_to_group(instance["Employees_G"])
-    desks_z = instance["Desks_Z"]
+    # instance: dict del JSON o CompiledInstance
+    ci = como_instancia(instance)
+    if inicial is None:
+        sol_actual, groups_days = generar_solucion(ci)
+    else:
+        sol_actual, groups_days = copy.deepcopy(inicial[0]), inicial[1]
 
-    valor_actual = evaluate_solution(sol_actual, instance_path)
+    valor_actual = evaluate_solution(sol_actual, ci)
+    indice = IndiceOcupacion.desde_solucion(ci.desks_z, sol_actual)
+    ev = EvaluadorIncremental.desde_solucion(ci, sol_actual)
+    empleados = IndiceEmpleados.desde_solucion(sol_actual)
     mejora = True
     iteracion = 0
 
-    while mejora:
-        mejora = False
-        mejor_sol = copy.deepcopy(sol_actual)
-        mejor_valor = valor_actual
+    pool = None
+    if workers and workers > 1 and tipo == "best":
+        from concurrent.futures import ProcessPoolExecutor
+        pool = ProcessPoolExecutor(max_workers=workers, initializer=_iniciar_proceso_busqueda,
+                                   initargs=(ci.raw, sol_actual, groups_days))
+        n_asignaciones = sum(len(lista) for zonas in sol_actual.values() for lista in zonas.values())
+        cortes = [n_asignaciones * k // workers for k in range(workers + 1)]
+        historial = []
+        enviados = 0   # movimientos ya enviados en iteraciones anteriores
+
+    try:
+        while mejora:
+            mejora = False
+            if pool is not None:
+                tramos = _explorar_tramos(pool, historial, enviados, valor_actual, cortes)
+                enviados = len(historial)
+                candidatos = [(m[0], k, m) for k, m in enumerate(tramos) if m is not None]
+                movimiento = min(candidatos)[2] if candidatos else None
+            else:
+                movimiento = explorar_vecindario(sol_actual, valor_actual, ci, groups_days, indice, ev, empleados,
+                                                 tipo)
+
+            if movimiento is not None:
+                aplicar_movimiento(sol_actual, ci, groups_days, indice, ev, empleados, movimiento)
+                if pool is not None:
+                    historial.append(movimiento)
+                valor_actual = movimiento[0]
+                mejora = True
+                iteracion += 1
+                print(f"[{tipo}] Iter {iteracion}: mejora encontrada → {valor_actual}")
+    finally:
+        if pool is not None:
+            pool.shutdown()
+
+    if ampliada:
+        sol_actual, valor_actual = busqueda_local_ampliada(sol_actual, groups_days, ci)
+
+    print(f"[{tipo}] Resultado final: {valor_actual}")
+    return sol_actual, valor_actual
+
 
-        days = list(sol_actual.keys())
+# =====================================================
+# Vecindarios ampliados con listas de candidatos y don't-look bits
+# =====================================================
+def busqueda_local_ampliada(sol, groups_days, instance, max_candidatos=16, max_evaluaciones=None):
+    """
+    First-improvement por empleado sobre la SolucionArray con cinco vecindarios:
+        - reasignar escritorio el mismo día (a un gusto libre o a una zona con su grupo)
+        - intercambiar escritorio con quien ocupa uno de sus gustos ese día
+        - cadena de expulsión: toma un gusto ocupado y el expulsado pasa a un gusto
+          suyo libre (pasar al escritorio que dejó e es el intercambio anterior)
+        - mover su segundo día a un día que le gusta
+        - intercambiar día con quien ocupa uno de sus gustos en un día que le gusta
+    Ningún movimiento saca a alguien de su día de reunión ni cambia cuántos días asiste.
 
-        for d_from in days:
-            for z_from in sol_actual[d_from]:
-                lista = sol_actual[d_from][z_from]
+    Listas de candidatos: por empleado, hasta max_candidatos escritorios preferidos
+    (primero los de las zonas donde se sienta su grupo en sol) y sus días preferidos,
+    calculados una vez; por escritorio, a quién lo tiene como candidato.
+    Don't-look bits: solo se revisan empleados activos; quien no encuentra mejora se
+    desactiva y se reactiva cuando un movimiento toca su grupo o libera uno de sus gustos.
+    El primer escritorio libre (por zona o del día) sale de dos IndiceOcupacion sobre
+    índices de escritorio, que se actualizan con cada movimiento aplicado.
+    Devuelve (sol en formato dict, puntaje).
+    """
+    ci = como_instancia(instance)
+    sa = SolucionArray.desde_dict(ci, sol)
+    ev = EvaluadorIncremental.desde_array(sa)
+    ocup, esc = sa.ocupante, sa.escritorio
+    T, E = ci.n_days, ci.n_employees
 
-                for idx in range(len(lista)):
-                    for d_to in days:
-                        if d_to == d_from:
-                            continue
+    miembros_l = [[] for _ in range(ci.n_groups)]
+    for e, g in enumerate(ci.emp_group.tolist()):
+        if g >= 0:
+            miembros_l[g].append(e)
+    zonas_grupo = [{int(ci.desk_zone[d]) for d in esc[m].ravel().tolist() if d != LIBRE} for m in miembros_l]
 
-                        vecina = copy.deepcopy(sol_actual)
-                        ok = mover_empleado_de_dia(
-                            vecina, d_from, z_from, idx, d_to, desks_z, employee_group, groups_days
-                        )
-                        if not ok:
-                            continue
+    # primer libre por (día, zona) y por día, en el orden de los índices de escritorio
+    libres_z = IndiceOcupacion({z: ds.tolist() for z, ds in enumerate(ci.zone_desks)}, range(T))
+    libres_dia = IndiceOcupacion({None: list(range(ci.n_desks))}, range(T))
+    for t, d in zip(*(ocup != LIBRE).nonzero()):
+        libres_z.ocupar(int(t), int(d))
+        libres_dia.ocupar(int(t), int(d))
 
-                        val_vecina = evaluate_solution(vecina, instance_path)
+    # candidatos desde los gustos dispersos (ids ordenados, calculados una vez por instancia)
+    desk_zone = ci.desk_zone.tolist()
+    emp_group = ci.emp_group.tolist()
+    gustos = []
+    interesados = [[] for _ in range(ci.n_desks)]
+    for e, liked in enumerate(_precalculo(ci)["gustos_idx"]):
+        zonas = zonas_grupo[emp_group[e]] if emp_group[e] >= 0 else set()
+        ls = sorted(liked, key=lambda d: desk_zone[d] not in zonas)[:max_candidatos]
+        gustos.append(ls)
+        for d in ls:
+            interesados[d].append(e)
+    dias_gusto = [row.nonzero()[0].tolist() for row in ci.day_pref]
+    dia_reunion = [LIBRE] * E
+    for g, d in groups_days.items():
+        if g in ci.group_idx:
+            for e in ci.employees_g[g]:
+                dia_reunion[ci.emp_idx[e]] = ci.day_idx[d]
 
-                        if val_vecina < mejor_valor:
-                            mejor_valor = val_vecina
-                            mejor_sol = vecina
-                            mejora = True
+    def libre_con_grupo(e, t):
+        """Primer escritorio libre en cada zona donde el grupo de e tiene a alguien el día t."""
+        g = ci.emp_group[e]
+        if g < 0:
+            return []
+        zonas = {int(ci.desk_zone[d]) for d in esc[miembros_l[g], t].tolist() if d != LIBRE}
+        out = []
+        for z in sorted(zonas):
+            d = libres_z.primero_libre(t, z)
+            if d is not None:
+                out.append(d)
+        return out
 
-                            if tipo == "first":
-                                break
-                    if mejora and tipo == "first":
+    def vecinos(e):
+        """Genera (quitar, poner, aplicar) de los movimientos candidatos de e."""
+        dias = [t for t in range(T) if esc[e, t] != LIBRE]
+        for t in dias:
+            d0 = int(esc[e, t])
+            for d in gustos[e] + libre_con_grupo(e, t):
+                if d == d0:
+                    continue
+                e2 = int(ocup[t, d])
+                if e2 == LIBRE:
+                    yield ((t, d0, e),), ((t, d, e),), lambda t=t, d=d: sa.mover(e, t, t, d)
+                    continue
+                # intercambio de escritorio
+                yield ((t, d0, e), (t, d, e2)), ((t, d, e), (t, d0, e2)), \
+                    lambda t=t, d0=d0, d=d: sa.intercambiar(t, d0, t, d)
+                # cadena de expulsión: e2 va a un gusto suyo libre
+                for d2 in gustos[e2]:
+                    if ocup[t, d2] == LIBRE:
+                        yield ((t, d0, e), (t, d, e2)), ((t, d, e), (t, d2, e2)), \
+                            lambda t=t, d=d, e2=e2, d2=d2: sa.reubicar(t, [(e, d), (e2, d2)])
                         break
-                if mejora and tipo == "first":
-                    break
-            if mejora and tipo == "first":
-                break
+        for t0 in dias:
+            if t0 == dia_reunion[e]:
+                continue
+            d0 = int(esc[e, t0])
+            for t1 in dias_gusto[e]:
+                if esc[e, t1] != LIBRE or t1 == dia_reunion[e]:
+                    continue
+                for d in gustos[e]:
+                    e2 = int(ocup[t1, d])
+                    if e2 == LIBRE:
+                        yield ((t0, d0, e),), ((t1, d, e),), lambda t0=t0, t1=t1, d=d: sa.mover(e, t0, t1, d)
+                    elif t1 != dia_reunion[e2] and esc[e2, t0] == LIBRE:
+                        # intercambio de día: e2 pasa al escritorio de e en t0
+                        yield ((t0, d0, e), (t1, d, e2)), ((t1, d, e), (t0, d0, e2)), \
+                            lambda t0=t0, d0=d0, t1=t1, d=d: sa.intercambiar(t0, d0, t1, d)
+                d = libres_dia.primero_libre(t1, None)
+                if d is not None:
+                    yield ((t0, d0, e),), ((t1, d, e),), lambda t0=t0, t1=t1, d=d: sa.mover(e, t0, t1, d)
 
-        if mejora:
-            sol_actual = mejor_sol
-            valor_actual = mejor_valor
-            iteracion += 1
-            print(f"[{tipo}] Iter {iteracion}: mejora encontrada → {valor_actual}")
+    activos = deque(range(E))
+    activo = [True] * E
+    evaluaciones = 0
 
-    print(f"[{tipo}] Resultado final: {valor_actual}")
-    return sol_actual, valor_actual
+    def activar(e):
+        if not activo[e]:
+            activo[e] = True
+            activos.append(e)
+
+    while activos and (max_evaluaciones is None or evaluaciones < max_evaluaciones):
+        e = activos.popleft()
+        activo[e] = False
+        for quitar, poner, hacer in vecinos(e):
+            contadores["movimientos"] += 1
+            evaluaciones += 1
+            if ev.delta(quitar, poner) < (0, 0, 0):
+                quitado, puesto = hacer()
+                ev.aplicar(quitado, puesto)
+                sa.confirmar()
+                for t, d, _ in quitado:
+                    libres_z.liberar(t, d)
+                    libres_dia.liberar(t, d)
+                for t, d, _ in puesto:
+                    libres_z.ocupar(t, d)
+                    libres_dia.ocupar(t, d)
+                tocados = {x for _, _, x in quitar}
+                for x in tocados:
+                    activar(x)
+                    g = ci.emp_group[x]
+                    if g >= 0:
+                        for y in miembros_l[g]:
+                            activar(y)
+                for _, d, _ in quitar:
+                    for y in interesados[d]:
+                        activar(y)
+                break
+
+    return sa.a_dict(), ev.puntaje()
 
 
 # =====================================================
 # Ejemplo de ejecución
 # =====================================================
-archivo = "instances/instance10.json"
-
-with open(archivo, "r", encoding="utf-8") as f:
-    instance = json.load(f)
+if __name__ == "__main__":
+    archivo = "instances/instance10.json"
+    instance = como_instancia(archivo)
 
-sol_best, val_best = local_search(archivo, instance, tipo="best")
-sol_first, val_first = local_search(archivo, instance, tipo="first")
+    sol_best, val_best = local_search(archivo, instance, tipo="best")
+    sol_first, val_first = local_search(archivo, instance, tipo="first")
 
-print("Best improvement:", val_best)
-print("First improvement:", val_first)
\ No newline at end of file
+    print("Best improvement:", val_best)
+    print("First improvement:", val_first)
@@ -0,0 +1,88 @@
+"""
+Punto de entrada único del proyecto.
+
+    python cli.py solve instances/instance1.json --metodo annealing --seed 0
+    python cli.py compare instances/instance1.json --corridas 1000
+    python cli.py export --instancias instances --salida resultados
+    python cli.py bench --repeticiones 3 --generadas 1000 5000
+
+Cada subcomando importa solo lo que usa: pandas/xlsxwriter se cargan únicamente
+al exportar o comparar, y ningún módulo ejecuta trabajo al importarse.
+"""
+import argparse
+import json
+import sys
+import time
+
+from benchmark import METODOS
+
+
+def cmd_solve(args):
+    from instancia import como_instancia
+    from benchmark import ejecutar_metodo
+
+    ci = como_instancia(args.instancia)
+    t0 = time.perf_counter()
+    sol, score = ejecutar_metodo(args.metodo, ci, args.seed)
+    elapsed = time.perf_counter() - t0
+    print(f"{args.metodo}: {score}  ({elapsed:.3f}s)")
+    if args.salida:
+        with open(args.salida, "w", encoding="utf-8") as f:
+            json.dump(sol, f, indent=2, ensure_ascii=False)
+        print(f"✅ Solución guardada en {args.salida}")
+
+
+def cmd_compare(args):
+    from comparativa_soluciones import main
+    main(args.instancia, N=args.corridas, seed=args.seed, workers=args.workers)
+
+
+def cmd_export(args):
+    from generar_excel import main
+    main(args.instancias, args.salida, workers=args.workers, seed=args.seed)
+
+
+def cmd_bench(args, opciones):
+    from benchmark import main
+    main(opciones)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Asignación de empleados a escritorios: métodos heurísticos.")
+    sub = parser.add_subparsers(dest="comando", required=True)
+
+    p = sub.add_parser("solve", help="resuelve una instancia con un método")
+    p.add_argument("instancia")
+    p.add_argument("--metodo", choices=METODOS, default="constructive")
+    p.add_argument("--seed", type=int, default=0)
+    p.add_argument("-o", "--salida", default=None, help="guarda la solución en JSON")
+    p.set_defaults(func=cmd_solve)
+
+    p = sub.add_parser("compare", help="comparativa de todos los métodos sobre una instancia")
+    p.add_argument("instancia", nargs="?", default="instances/instance1.json")
+    p.add_argument("--corridas", type=int, default=1000, help="corridas del método aleatorio")
+    p.add_argument("--seed", type=int, default=None, help="semilla del lote aleatorio (por defecto, una nueva)")
+    p.add_argument("--workers", type=int, default=None, help="procesos para el lote aleatorio")
+    p.set_defaults(func=cmd_compare)
+
+    p = sub.add_parser("export", help="genera los Excel de resultados/ para todas las instancias")
+    p.add_argument("--instancias", default="instances")
+    p.add_argument("--salida", default="resultados")
+    p.add_argument("--workers", type=int, default=None, help="procesos en paralelo (por defecto, secuencial)")
+    p.add_argument("--seed", type=int, default=0, help="semilla de los métodos aleatorios (misma salida con o sin workers)")
+    p.set_defaults(func=cmd_export)
+
+    sub.add_parser("bench", help="benchmark (acepta las opciones de benchmark.py)", add_help=False)
+
+    # las opciones de 'bench' las interpreta benchmark.py
+    args, resto = parser.parse_known_args(argv)
+    if args.comando == "bench":
+        cmd_bench(args, resto)
+        return
+    if resto:
+        parser.error(f"argumentos no reconocidos: {' '.join(resto)}")
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -1,18 +1,21 @@
 import time
-import pandas as pd
-from metodo_constructivo_aleatorio import randomized_solution_desde_archivo
+import secrets
+from metodo_constructivo_aleatorio import randomized_batch
 from metodo_constructivo import generar_solucion_desde_archivo
 from score import evaluate_solution
 from metodo_aleatorio import simulated_annealing_assignments
 from metodo_vns import vns_assignments
 from busqueda_local import local_search
+from instancia import como_instancia
 
 
 # ======================================================
 # FUNCIONES AUXILIARES
 # ======================================================
 
-def solution_to_employee_table(sol, days=("L", "Ma", "Mi", "J", "V")) -> pd.DataFrame:
+def solution_to_employee_table(sol, days=("L", "Ma", "Mi", "J", "V")):
+    import pandas as pd   # solo se importa al construir tablas
+
     employees = set()
     for d in sol.values():
         for assigns in d.values():
@@ -40,186 +43,183 @@ def solution_to_employee_table(sol, days=("L", "Ma", "Mi", "J", "V")) -> pd.Data
 
 
 # ======================================================
-# CONFIGURACIÓN GENERAL
-# ======================================================
-
-archivo = "instances/instance1.json"
-N = 1000
-
-import json
-
-with open(archivo, "r", encoding="utf-8") as f:
-    instance = json.load(f)
-
-# ======================================================
-# 1) MÉTODO ALEATORIO (N corridas)
-# ======================================================
-scores = []
-solutions = []
-groups_list = []
-
-t0 = time.perf_counter()
-for _ in range(N):
-    sol, groups = randomized_solution_desde_archivo(archivo)
-    s = evaluate_solution(sol, archivo)
-    scores.append(s)
-    solutions.append(sol)
-    groups_list.append(groups)
-elapsed_random = time.perf_counter() - t0
-
-mean_score = (
-    sum(s[0] for s in scores) / N,
-    sum(s[1] for s in scores) / N,
-    sum(s[2] for s in scores) / N,
-)
-
-best_score = min(scores)
-best_index = scores.index(best_score)
-best_solution = solutions[best_index]
-best_groups = groups_list[best_index]
-
-# ======================================================
-# 2) MÉTODO CONSTRUCTIVO
-# ======================================================
-t1 = time.perf_counter()
-constructive_solution, constructive_groups = generar_solucion_desde_archivo(archivo)
-constructive_score = evaluate_solution(constructive_solution, archivo)
-elapsed_constructive = time.perf_counter() - t1
-
-# ======================================================
-# 3) RECOCIDO SIMULADO (Simulated Annealing)
-# ======================================================
-t2 = time.perf_counter()
-best_solution_annealing, best_score_annealing, trace_annealing = simulated_annealing_assignments(
-    constructive_solution, constructive_groups, archivo
-)
-elapsed_annealing = time.perf_counter() - t2
-
-# ======================================================
-# 4) VNS (Variable Neighborhood Search)
-# ======================================================
-t3 = time.perf_counter()
-best_solution_vns, best_score_vns, trace_vns = vns_assignments(
-    constructive_solution, constructive_groups, archivo
-)
-elapsed_vns = time.perf_counter() - t3
-
-# ======================================================
-# 5) BÚSQUEDA LOCAL
-# ======================================================
-t4 = time.perf_counter()
-
-best_solution_local_best, best_score_local_best = local_search(archivo, instance, tipo="best")
-best_solution_local_first, best_score_local_first = local_search(archivo, instance, tipo="first")
-
-elapsed_local = time.perf_counter() - t4
-
-# ======================================================
-# 6) RESUMEN DE RESULTADOS
-# ======================================================
-summary = pd.DataFrame([
-    {
-        "method": "randomized",
-        "n_runs": N,
-        "mean_valid": mean_score[0],
-        "mean_pref": mean_score[1],
-        "mean_isolated": mean_score[2],
-        "best_valid": best_score[0],
-        "best_pref": best_score[1],
-        "best_isolated": best_score[2],
-        "total_time_s": elapsed_random,
-    },
-    {
-        "method": "constructive",
-        "n_runs": 1,
-        "mean_valid": constructive_score[0],
-        "mean_pref": constructive_score[1],
-        "mean_isolated": constructive_score[2],
-        "best_valid": constructive_score[0],
-        "best_pref": constructive_score[1],
-        "best_isolated": constructive_score[2],
-        "total_time_s": elapsed_constructive,
-    },
-    {
-        "method": "annealing",
-        "n_runs": 1000,
-        "mean_valid": best_score_annealing[0],
-        "mean_pref": best_score_annealing[1],
-        "mean_isolated": best_score_annealing[2],
-        "best_valid": best_score_annealing[0],
-        "best_pref": best_score_annealing[1],
-        "best_isolated": best_score_annealing[2],
-        "total_time_s": elapsed_annealing,
-    },
-    {
-        "method": "vns",
-        "n_runs": 1,
-        "mean_valid": best_score_vns[0],
-        "mean_pref": best_score_vns[1],
-        "mean_isolated": best_score_vns[2],
-        "best_valid": best_score_vns[0],
-        "best_pref": best_score_vns[1],
-        "best_isolated": best_score_vns[2],
-        "total_time_s": elapsed_vns,
-    },
-    {
-        "method": "local_search_best",
-        "n_runs": 1,
-        "mean_valid": best_score_local_best[0],
-        "mean_pref": best_score_local_best[1],
-        "mean_isolated": best_score_local_best[2],
-        "best_valid": best_score_local_best[0],
-        "best_pref": best_score_local_best[1],
-        "best_isolated": best_score_local_best[2],
-        "total_time_s": elapsed_local,
-    },
-    {
-        "method": "local_search_first",
-        "n_runs": 1,
-        "mean_valid": best_score_local_first[0],
-        "mean_pref": best_score_local_first[1],
-        "mean_isolated": best_score_local_first[2],
-        "best_valid": best_score_local_first[0],
-        "best_pref": best_score_local_first[1],
-        "best_isolated": best_score_local_first[2],
-        "total_time_s": elapsed_local,
-    },
-])
-
-print("\n==================== RESUMEN DE MÉTODOS ====================")
-print(summary)
-
-# ======================================================
-# 7) TABLAS DE ASIGNACIÓN POR EMPLEADO
-# ======================================================
-
-constructive_table = solution_to_employee_table(constructive_solution)
-random_table = solution_to_employee_table(best_solution)
-annealing_table = solution_to_employee_table(best_solution_annealing)
-vns_table = solution_to_employee_table(best_solution_vns)
-local_table_best = solution_to_employee_table(best_solution_local_best)
-local_table_first = solution_to_employee_table(best_solution_local_first)
-
-print("\n--- Asignaciones por empleado (mejor solución aleatoria) ---")
-print(random_table)
-print(best_score)
-
-print("\n--- Asignaciones por empleado (constructivo) ---")
-print(constructive_table)
-print(constructive_score)
-
-print("\n--- Asignaciones por empleado (mejor solución con recocido simulado) ---")
-print(annealing_table)
-print(best_score_annealing)
-
-print("\n--- Asignaciones por empleado (mejor solución con VNS) ---")
-print(vns_table)
-print(best_score_vns)
-
-print("\n--- Asignaciones por empleado (búsqueda local - best improvement) ---")
-print(local_table_best)
-print(best_score_local_best)
-
-print("\n--- Asignaciones por empleado (búsqueda local - first improvement) ---")
-print(local_table_first)
-print(best_score_local_first)
+# EXPERIMENTO COMPLETO
+# ======================================================
+
+def main(archivo="instances/instance1.json", N=1000, seed=None, workers=None):
+    """
+    Ejecuta todos los métodos sobre una instancia e imprime el resumen y las tablas.
+    seed: semilla del lote aleatorio (None -> una nueva, que se imprime para poder repetirlo).
+    """
+    import pandas as pd
+
+    # instancia compilada una sola vez y compartida por todos los métodos
+    instance = como_instancia(archivo)
+
+    # ======================================================
+    # 1) MÉTODO ALEATORIO (N corridas)
+    # ======================================================
+    if seed is None:
+        seed = secrets.randbits(32)
+    print(f"Semilla del lote aleatorio: {seed}")
+
+    # solo se guarda la mejor corrida y las estadísticas (memoria constante en N)
+    t0 = time.perf_counter()
+    lote = randomized_batch(instance, N, seed=seed, workers=workers, k=1)
+    elapsed_random = time.perf_counter() - t0
+
+    mean_score = lote["media"]
+    best_score = lote["elite"][0]["score"]
+    best_solution = lote["elite"][0]["solucion"]
+    best_groups = lote["elite"][0]["groups_days"]
+
+    # ======================================================
+    # 2) MÉTODO CONSTRUCTIVO
+    # ======================================================
+    t1 = time.perf_counter()
+    constructive_solution, constructive_groups = generar_solucion_desde_archivo(instance)
+    constructive_score = evaluate_solution(constructive_solution, instance)
+    elapsed_constructive = time.perf_counter() - t1
+
+    # ======================================================
+    # 3) RECOCIDO SIMULADO (Simulated Annealing)
+    # ======================================================
+    t2 = time.perf_counter()
+    best_solution_annealing, best_score_annealing, trace_annealing = simulated_annealing_assignments(
+        constructive_solution, constructive_groups, instance
+    )
+    elapsed_annealing = time.perf_counter() - t2
+
+    # ======================================================
+    # 4) VNS (Variable Neighborhood Search)
+    # ======================================================
+    t3 = time.perf_counter()
+    best_solution_vns, best_score_vns, trace_vns = vns_assignments(
+        constructive_solution, constructive_groups, instance
+    )
+    elapsed_vns = time.perf_counter() - t3
+
+    # ======================================================
+    # 5) BÚSQUEDA LOCAL
+    # ======================================================
+    t4 = time.perf_counter()
+    best_solution_local_best, best_score_local_best = local_search(archivo, instance, tipo="best")
+    elapsed_local_best = time.perf_counter() - t4
+
+    t5 = time.perf_counter()
+    best_solution_local_first, best_score_local_first = local_search(archivo, instance, tipo="first")
+    elapsed_local_first = time.perf_counter() - t5
+
+    # ======================================================
+    # 6) RESUMEN DE RESULTADOS
+    # ======================================================
+    summary = pd.DataFrame([
+        {
+            "method": "randomized",
+            "n_runs": N,
+            "mean_valid": mean_score[0],
+            "mean_pref": mean_score[1],
+            "mean_isolated": mean_score[2],
+            "best_valid": best_score[0],
+            "best_pref": best_score[1],
+            "best_isolated": best_score[2],
+            "total_time_s": elapsed_random,
+        },
+        {
+            "method": "constructive",
+            "n_runs": 1,
+            "mean_valid": constructive_score[0],
+            "mean_pref": constructive_score[1],
+            "mean_isolated": constructive_score[2],
+            "best_valid": constructive_score[0],
+            "best_pref": constructive_score[1],
+            "best_isolated": constructive_score[2],
+            "total_time_s": elapsed_constructive,
+        },
+        {
+            "method": "annealing",
+            "n_runs": 1000,
+            "mean_valid": best_score_annealing[0],
+            "mean_pref": best_score_annealing[1],
+            "mean_isolated": best_score_annealing[2],
+            "best_valid": best_score_annealing[0],
+            "best_pref": best_score_annealing[1],
+            "best_isolated": best_score_annealing[2],
+            "total_time_s": elapsed_annealing,
+        },
+        {
+            "method": "vns",
+            "n_runs": 1,
+            "mean_valid": best_score_vns[0],
+            "mean_pref": best_score_vns[1],
+            "mean_isolated": best_score_vns[2],
+            "best_valid": best_score_vns[0],
+            "best_pref": best_score_vns[1],
+            "best_isolated": best_score_vns[2],
+            "total_time_s": elapsed_vns,
+        },
+        {
+            "method": "local_search_best",
+            "n_runs": 1,
+            "mean_valid": best_score_local_best[0],
+            "mean_pref": best_score_local_best[1],
+            "mean_isolated": best_score_local_best[2],
+            "best_valid": best_score_local_best[0],
+            "best_pref": best_score_local_best[1],
+            "best_isolated": best_score_local_best[2],
+            "total_time_s": elapsed_local_best,
+        },
+        {
+            "method": "local_search_first",
+            "n_runs": 1,
+            "mean_valid": best_score_local_first[0],
+            "mean_pref": best_score_local_first[1],
+            "mean_isolated": best_score_local_first[2],
+            "best_valid": best_score_local_first[0],
+            "best_pref": best_score_local_first[1],
+            "best_isolated": best_score_local_first[2],
+            "total_time_s": elapsed_local_first,
+        },
+    ])
+
+    print("\n==================== RESUMEN DE MÉTODOS ====================")
+    print(summary)
+
+    # ======================================================
+    # 7) TABLAS DE ASIGNACIÓN POR EMPLEADO
+    # ======================================================
+
+    constructive_table = solution_to_employee_table(constructive_solution)
+    random_table = solution_to_employee_table(best_solution)
+    annealing_table = solution_to_employee_table(best_solution_annealing)
+    vns_table = solution_to_employee_table(best_solution_vns)
+    local_table_best = solution_to_employee_table(best_solution_local_best)
+    local_table_first = solution_to_employee_table(best_solution_local_first)
+
+    print("\n--- Asignaciones por empleado (mejor solución aleatoria) ---")
+    print(random_table)
+    print(best_score)
+
+    print("\n--- Asignaciones por empleado (constructivo) ---")
+    print(constructive_table)
+    print(constructive_score)
+
+    print("\n--- Asignaciones por empleado (mejor solución con recocido simulado) ---")
+    print(annealing_table)
+    print(best_score_annealing)
+
+    print("\n--- Asignaciones por empleado (mejor solución con VNS) ---")
+    print(vns_table)
+    print(best_score_vns)
+
+    print("\n--- Asignaciones por empleado (búsqueda local - best improvement) ---")
+    print(local_table_best)
+    print(best_score_local_best)
+
+    print("\n--- Asignaciones por empleado (búsqueda local - first improvement) ---")
+    print(local_table_first)
+    print(best_score_local_first)
+
+
+if __name__ == "__main__":
+    main()
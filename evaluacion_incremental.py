@@ -0,0 +1,234 @@
+import random
+from typing import Dict, Iterable, List, Tuple
+
+from instancia import CompiledInstance, como_instancia
+from score import evaluate_solution, contadores
+from metodo_constructivo_aleatorio import _precalculo
+
+# (día, escritorio, empleado) en ids enteros de la CompiledInstance
+Asignacion = Tuple[int, int, int]
+
+
+# =========================
+# Evaluador incremental
+# =========================
+class EvaluadorIncremental:
+    """
+    Mantiene los conteos por (día, zona, grupo) y los totales de cada componente
+    del puntaje (inválidas, preferencias, aislados), y calcula el cambio de la
+    tupla de evaluate_solution para un movimiento sin recorrer toda la solución.
+
+    Un movimiento se describe como las asignaciones que se quitan y las que se
+    ponen; el costo es O(asignaciones tocadas): O(1) para swaps y movimientos de
+    un empleado, O(tamaño del grupo) para reubicar un grupo de zona.
+
+    Memoria O(asignaciones + gustos): los gustos de escritorio son los frozensets
+    de _precalculo (compartidos entre evaluadores de la misma instancia) y los
+    conteos solo guardan las celdas no vacías.
+
+    Supone (como todo el código del repo) que cada escritorio aparece en la lista
+    de su propia zona.
+    """
+
+    def __init__(self, ci: CompiledInstance, asignaciones: Iterable[Asignacion] = ()):
+        self.ci = ci
+        self.n_zones = ci.n_zones
+        self.n_groups = max(ci.n_groups, 1)
+
+        # listas de Python: el acceso escalar es mucho más rápido que en NumPy. Los gustos
+        # de escritorio son un frozenset por empleado (disperso, compartido por instancia).
+        self.gustos: List[frozenset] = _precalculo(ci)["gustos_set"]
+        self.day_ok: List[List[bool]] = ci.day_pref.tolist()
+        self.desk_zone: List[int] = ci.desk_zone.tolist()
+        self.emp_group: List[int] = ci.emp_group.tolist()
+
+        self.conteo: Dict[int, int] = {}   # celda (día, zona, grupo) -> empleados; solo celdas no vacías
+        self.invalid = 0
+        self.preference = 0
+        self.isolated = 0
+        self.aplicar((), asignaciones)
+
+    @classmethod
+    def desde_solucion(cls, instance, sol: Dict[str, Dict[str, List[Tuple[str, str]]]]) -> "EvaluadorIncremental":
+        ci = como_instancia(instance)
+        return cls(ci, ci.solucion_a_asignaciones(sol).tolist())
+
+    @classmethod
+    def desde_array(cls, sol_array) -> "EvaluadorIncremental":
+        """Construye el evaluador a partir de una SolucionArray."""
+        return cls(sol_array.ci, sol_array.asignaciones())
+
+    def a_ids(self, day: str, desk: str, emp: str) -> Asignacion:
+        """(día, escritorio, empleado) en strings -> ids."""
+        ci = self.ci
+        return ci.day_idx[day], ci.desk_idx[desk], ci.emp_idx[emp]
+
+    def puntaje(self) -> Tuple[int, int, int]:
+        return self.invalid, self.preference, self.isolated
+
+    def _celda(self, t: int, d: int, e: int) -> int:
+        g = self.emp_group[e]
+        if g < 0:   # robustez: empleados sin grupo no cuentan para aislados
+            return -1
+        return (t * self.n_zones + self.desk_zone[d]) * self.n_groups + g
+
+    def _cambios(self, quitar: Iterable[Asignacion], poner: Iterable[Asignacion]):
+        dinv = dpref = 0
+        celdas: Dict[int, int] = {}
+        for signo, asignaciones in ((-1, quitar), (1, poner)):
+            for t, d, e in asignaciones:
+                if d not in self.gustos[e]:
+                    dinv += signo
+                if not self.day_ok[e][t]:
+                    dpref += signo
+                c = self._celda(t, d, e)
+                if c >= 0:
+                    celdas[c] = celdas.get(c, 0) + signo
+        return dinv, dpref, celdas
+
+    def delta(self, quitar: Iterable[Asignacion], poner: Iterable[Asignacion]) -> Tuple[int, int, int]:
+        """Cambio de (inválidas, preferencias, aislados) si se quitan y ponen esas asignaciones."""
+        contadores["evaluaciones"] += 1
+        dinv, dpref, celdas = self._cambios(quitar, poner)
+        diso = 0
+        conteo = self.conteo
+        for c, k in celdas.items():
+            if k:
+                antes = conteo.get(c, 0)
+                diso += (antes + k == 1) - (antes == 1)
+        return dinv, dpref, diso
+
+    def aplicar(self, quitar: Iterable[Asignacion], poner: Iterable[Asignacion]) -> Tuple[int, int, int]:
+        """Aplica el movimiento sobre los conteos y devuelve su delta."""
+        dinv, dpref, celdas = self._cambios(quitar, poner)
+        diso = 0
+        conteo = self.conteo
+        for c, k in celdas.items():
+            if k:
+                antes = conteo.get(c, 0)
+                if antes + k:
+                    conteo[c] = antes + k
+                else:
+                    del conteo[c]
+                diso += (antes + k == 1) - (antes == 1)
+        self.invalid += dinv
+        self.preference += dpref
+        self.isolated += diso
+        return dinv, dpref, diso
+
+    # -------------------------
+    # Movimientos habituales
+    # -------------------------
+    def delta_intercambio(self, t1: int, d1: int, e1: int, t2: int, d2: int, e2: int) -> Tuple[int, int, int]:
+        """e1 (en t1,d1) y e2 (en t2,d2) intercambian lugar."""
+        return self.delta(((t1, d1, e1), (t2, d2, e2)), ((t1, d1, e2), (t2, d2, e1)))
+
+    def delta_mover(self, e: int, t_from: int, d_from: int, t_to: int, d_to: int) -> Tuple[int, int, int]:
+        """e deja (t_from, d_from) y pasa a ocupar (t_to, d_to)."""
+        return self.delta(((t_from, d_from, e),), ((t_to, d_to, e),))
+
+    def delta_reubicar(self, t: int, movimientos: Iterable[Tuple[int, int, int]]) -> Tuple[int, int, int]:
+        """Reubicación de zona en el día t: movimientos = [(empleado, desk_origen, desk_destino)]."""
+        movimientos = list(movimientos)
+        return self.delta(
+            [(t, d0, e) for e, d0, _ in movimientos],
+            [(t, d1, e) for e, _, d1 in movimientos],
+        )
+
+
+def sumar_delta(score: Tuple[int, int, int], delta: Tuple[int, int, int]) -> Tuple[int, int, int]:
+    return score[0] + delta[0], score[1] + delta[1], score[2] + delta[2]
+
+
+# =========================
+# Verificación contra score.py
+# =========================
+def verificar_equivalencia(instance, n_movimientos: int = 2000, seed: int = 0) -> int:
+    """
+    Aplica movimientos aleatorios (swap, mover, reubicar zona) sobre la solución
+    constructiva y compara en cada paso el puntaje incremental con evaluate_solution.
+    Lanza AssertionError ante la primera diferencia; devuelve los movimientos probados.
+    """
+    from metodo_constructivo import generar_solucion
+
+    ci = como_instancia(instance)
+    rng = random.Random(seed)
+    sol, _ = generar_solucion(ci)
+    ev = EvaluadorIncremental.desde_solucion(ci, sol)
+    assert ev.puntaje() == evaluate_solution(sol, ci)
+
+    def ubicar():
+        day = rng.choice(ci.days)
+        zone = rng.choice(ci.zones)
+        if not sol[day][zone]:
+            return None
+        i = rng.randrange(len(sol[day][zone]))
+        return day, zone, i
+
+    for _ in range(n_movimientos):
+        tipo = rng.choice(("swap", "mover", "zona"))
+        if tipo == "swap":
+            a, b = ubicar(), ubicar()
+            if a is None or b is None or a == b:
+                continue
+            (da, za, ia), (db, zb, ib) = a, b
+            desk_a, emp_a = sol[da][za][ia]
+            desk_b, emp_b = sol[db][zb][ib]
+            t1, d1, e1 = ev.a_ids(da, desk_a, emp_a)
+            t2, d2, e2 = ev.a_ids(db, desk_b, emp_b)
+            delta = ev.delta_intercambio(t1, d1, e1, t2, d2, e2)
+            quitar, poner = ((t1, d1, e1), (t2, d2, e2)), ((t1, d1, e2), (t2, d2, e1))
+            sol[da][za][ia] = (desk_a, emp_b)
+            sol[db][zb][ib] = (desk_b, emp_a)
+        elif tipo == "mover":
+            a = ubicar()
+            if a is None:
+                continue
+            day, zone, i = a
+            desk, emp = sol[day][zone][i]
+            day_to = rng.choice(ci.days)
+            ocupados = {dk for asg in sol[day_to].values() for dk, _ in asg}
+            libres = [dk for dk in ci.desks if dk not in ocupados]
+            if not libres:
+                continue
+            desk_to = rng.choice(libres)
+            t0, d0, e = ev.a_ids(day, desk, emp)
+            t1, d1 = ci.day_idx[day_to], ci.desk_idx[desk_to]
+            delta = ev.delta_mover(e, t0, d0, t1, d1)
+            quitar, poner = ((t0, d0, e),), ((t1, d1, e),)
+            sol[day][zone].pop(i)
+            sol[day_to][ci.zone_of[desk_to]].append((desk_to, emp))
+        else:
+            day = rng.choice(ci.days)
+            g = rng.choice(ci.groups)
+            miembros = [(z, desk, emp) for z, asg in sol[day].items() for desk, emp in asg
+                        if ci.emp_to_group.get(emp) == g]
+            zone_dest = rng.choice(ci.zones)
+            ocupados = {dk for asg in sol[day].values() for dk, _ in asg}
+            libres = [dk for dk in ci.desks_z[zone_dest] if dk not in ocupados]
+            if not miembros or len(libres) < len(miembros):
+                continue
+            t = ci.day_idx[day]
+            movs = [(ci.emp_idx[emp], ci.desk_idx[desk], ci.desk_idx[nuevo])
+                    for (_, desk, emp), nuevo in zip(miembros, libres)]
+            delta = ev.delta_reubicar(t, movs)
+            quitar = [(t, d0, e) for e, d0, _ in movs]
+            poner = [(t, d1, e) for e, _, d1 in movs]
+            for z in sol[day]:
+                sol[day][z] = [(desk, emp) for desk, emp in sol[day][z] if ci.emp_to_group.get(emp) != g]
+            for (_, _, emp), nuevo in zip(miembros, libres):
+                sol[day][zone_dest].append((nuevo, emp))
+
+        antes = ev.puntaje()
+        assert ev.aplicar(quitar, poner) == delta
+        esperado = evaluate_solution(sol, ci)
+        assert ev.puntaje() == esperado == sumar_delta(antes, delta), (tipo, ev.puntaje(), esperado)
+
+    return n_movimientos
+
+
+if __name__ == "__main__":
+    for i in range(1, 11):
+        path = f"instances/instance{i}.json"
+        verificar_equivalencia(path, seed=i)
+        print(f"✅ {path}: evaluador incremental == score.py")
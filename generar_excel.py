@@ -1,20 +1,22 @@
 import os
-import pandas as pd
-import json
+import random
+import zlib
 from metodo_constructivo import generar_solucion_desde_archivo
-from metodo_constructivo_aleatorio import randomized_solution_desde_archivo
+from metodo_constructivo_aleatorio import randomized_solution_desde_archivo, semilla_corrida
 from metodo_aleatorio import simulated_annealing_assignments
 from metodo_vns import vns_assignments
 from busqueda_local import local_search  # 🧩 Nuevo import
-from score import evaluate_solution
+from instancia import como_instancia
 
 
 # ======================================================
 # FUNCIONES AUXILIARES
 # ======================================================
 
-def solution_to_employee_table(sol, days=("L", "Ma", "Mi", "J", "V")) -> pd.DataFrame:
+def solution_to_employee_table(sol, days=("L", "Ma", "Mi", "J", "V")):
     """Convierte una solución en una tabla por empleado, usando 'None' donde no hay asignación."""
+    import pandas as pd   # pandas/xlsxwriter solo se cargan en la ruta de exportación
+
     employees = set()
     for d in sol.values():
         for assigns in d.values():
@@ -46,13 +48,15 @@ def solution_to_employee_table(sol, days=("L", "Ma", "Mi", "J", "V")) -> pd.Data
 # ======================================================
 
 def calcular_resumen(sol, instance):
-    """Calcula las tres métricas pedidas a partir de la solución y la instancia JSON."""
-    desks_e = instance["Desks_E"]
-    days_e = instance["Days_E"]
-    employees_g = instance["Employees_G"]
+    """Calcula las tres métricas pedidas a partir de la solución y la instancia (dict o CompiledInstance)."""
+    import pandas as pd
+
+    ci = como_instancia(instance)
+    desks_e = ci.desks_e
+    days_e = ci.days_e
 
-    # Crear un mapa inverso empleado→grupo
-    emp_to_group = {emp: g for g, emps in employees_g.items() for emp in emps}
+    # mapa inverso empleado→grupo (precalculado en la instancia compilada)
+    emp_to_group = ci.emp_to_group
 
     valid_assignments = 0
     pref_assignments = 0
@@ -98,77 +102,122 @@ def calcular_resumen(sol, instance):
 # PROCESADOR DE INSTANCIAS
 # ======================================================
 
-def procesar_instancia(path_json: str):
-    """Dada una instancia (archivo JSON), genera todas las soluciones y devuelve los DataFrames listos para exportar."""
-    print(f"\n🔹 Procesando instancia: {path_json}")
-
-    with open(path_json, "r", encoding="utf-8") as f:
-        instance = json.load(f)
-
-    days_e = instance["Days_E"]
-    employees_g = instance["Employees_G"]
-    groups = list(employees_g.keys())
-
-    # =====================================================
-    # MÉTODOS HEURÍSTICOS
-    # =====================================================
-    constructive_solution, constructive_groups = generar_solucion_desde_archivo(path_json)
-    randomized_solution, randomized_groups = randomized_solution_desde_archivo(path_json)
-    annealing_solution, _, _ = simulated_annealing_assignments(constructive_solution, constructive_groups, path_json)
-    vns_solution, _, _ = vns_assignments(constructive_solution, constructive_groups, path_json)
-
-    # =====================================================
-    # BÚSQUEDA LOCAL (nuevo)
-    # =====================================================
-    print("⚙️ Ejecutando búsqueda local (mejor mejora)...")
-    local_solution, _ = local_search(path_json, instance, tipo="best")
-
-    # =====================================================
-    # CREAR DATAFRAMES DE ASIGNACIÓN
-    # =====================================================
-    df_constructive = solution_to_employee_table(constructive_solution)
-    df_randomized = solution_to_employee_table(randomized_solution)
-    df_annealing = solution_to_employee_table(annealing_solution)
-    df_vns = solution_to_employee_table(vns_solution)
-    df_local = solution_to_employee_table(local_solution)
-
-    # Crear DataFrame de grupos sin encabezado
-    df_group_days = pd.DataFrame([[g, constructive_groups.get(g, "None")] for g in groups])
-
-    # =====================================================
-    # CREAR DATAFRAMES DE RESUMEN
-    # =====================================================
-    df_summary_constructive = calcular_resumen(constructive_solution, instance)
-    df_summary_randomized = calcular_resumen(randomized_solution, instance)
-    df_summary_annealing = calcular_resumen(annealing_solution, instance)
-    df_summary_vns = calcular_resumen(vns_solution, instance)
-    df_summary_local = calcular_resumen(local_solution, instance)
+METODOS = ["constructive", "randomized", "annealing", "vns", "local_search"]
+
+
+def semilla_metodo(nombre: str, metodo: str, seed: int = 0) -> int:
+    """Semilla fija del par (instancia, método): la salida no depende de workers ni del orden."""
+    return semilla_corrida(seed, zlib.crc32(f"{nombre}/{metodo}".encode("utf-8")))
+
+
+def ejecutar_metodo(path_json: str, metodo: str, constructiva=None, seed: int = None):
+    """
+    Corre un método sobre la instancia y devuelve (solución, groups_days).
+    Es la unidad de trabajo del modo paralelo: recibe solo la ruta, así que se puede
+    enviar a otro proceso (la instancia se carga una vez por proceso gracias al cache).
+    constructiva: (solución, groups_days) del constructivo ya calculada para esta
+    instancia (None -> se calcula). seed: semilla de los métodos aleatorios.
+    """
+    instance = como_instancia(path_json)
+
+    if metodo == "randomized":
+        return randomized_solution_desde_archivo(instance, seed=seed)
+
+    if constructiva is None:
+        constructiva = generar_solucion_desde_archivo(instance)
+    constructive_solution, constructive_groups = constructiva
+    if metodo == "constructive":
+        return constructive_solution, constructive_groups
+    if metodo == "annealing":
+        annealing_solution, _, _ = simulated_annealing_assignments(constructive_solution, constructive_groups,
+                                                                   instance, seed=seed)
+        return annealing_solution, constructive_groups
+    if metodo == "vns":
+        if seed is not None:
+            random.seed(seed)   # VNS usa el generador global
+        vns_solution, _, _ = vns_assignments(constructive_solution, constructive_groups, instance)
+        return vns_solution, constructive_groups
+    if metodo == "local_search":
+        print("⚙️ Ejecutando búsqueda local (mejor mejora)...")
+        local_solution, _ = local_search(path_json, instance, tipo="best", inicial=constructiva)
+        return local_solution, constructive_groups
+    raise ValueError(f"Método desconocido: {metodo}")
+
+
+def armar_resultados(path_json: str, soluciones):
+    """soluciones: {metodo: (solución, groups_days)} -> DataFrames listos para exportar."""
+    import pandas as pd
+
+    instance = como_instancia(path_json)
+    groups = instance.groups
 
     resultados = {
-        "constructive": {"solution": df_constructive, "summary": df_summary_constructive},
-        "randomized": {"solution": df_randomized, "summary": df_summary_randomized},
-        "annealing": {"solution": df_annealing, "summary": df_summary_annealing},
-        "vns": {"solution": df_vns, "summary": df_summary_vns},
-        "local_search": {"solution": df_local, "summary": df_summary_local},
-        "group_days": df_group_days,
+        metodo: {
+            "solution": solution_to_employee_table(sol),
+            "summary": calcular_resumen(sol, instance),
+        }
+        for metodo, (sol, _) in soluciones.items()
     }
 
+    # Crear DataFrame de grupos sin encabezado (días de reunión del constructivo)
+    constructive_groups = soluciones["constructive"][1]
+    resultados["group_days"] = pd.DataFrame([[g, constructive_groups.get(g, "None")] for g in groups])
     return resultados
 
 
+def procesar_instancia(path_json: str, nombre: str = None, seed: int = 0):
+    """Dada una instancia (archivo JSON), genera todas las soluciones y devuelve los DataFrames listos para exportar."""
+    print(f"\n🔹 Procesando instancia: {path_json}")
+    nombre = nombre or os.path.splitext(os.path.basename(path_json))[0]
+    constructiva = ejecutar_metodo(path_json, "constructive")
+    soluciones = {
+        metodo: ejecutar_metodo(path_json, metodo, constructiva, semilla_metodo(nombre, metodo, seed))
+        for metodo in METODOS
+    }
+    return armar_resultados(path_json, soluciones)
+
+
 # ======================================================
 # PROCESAR TODAS LAS INSTANCIAS
 # ======================================================
 
-def procesar_todas_las_instancias(instances_folder="instances"):
-    resultados_globales = {}
+def procesar_todas_las_instancias(instances_folder="instances", workers=None, seed=0):
+    """
+    Procesa instance1..instance10. Con workers > 1 reparte los trabajos (instancia, método)
+    en un pool de procesos; los resultados se recogen por clave y se arman en el mismo
+    orden que el modo secuencial, así que la salida no depende del orden de llegada.
+    El constructivo se calcula una vez por instancia y se comparte con los métodos que
+    parten de él; cada trabajo recibe semilla_metodo(instancia, método, seed), así que
+    ambos modos dan la misma salida.
+    """
+    archivos = {}
     for i in range(1, 11):
         file_path = os.path.join(instances_folder, f"instance{i}.json")
         if not os.path.exists(file_path):
             print(f"⚠️ No se encontró {file_path}")
             continue
-        resultados_globales[f"instance{i}"] = procesar_instancia(file_path)
-    return resultados_globales
+        archivos[f"instance{i}"] = file_path
+
+    if not workers or workers <= 1:
+        return {nombre: procesar_instancia(path, nombre, seed) for nombre, path in archivos.items()}
+
+    from concurrent.futures import ProcessPoolExecutor
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        constructivas = dict(zip(archivos, pool.map(ejecutar_metodo, archivos.values(),
+                                                    ["constructive"] * len(archivos))))
+        futuros = {
+            (nombre, metodo): pool.submit(ejecutar_metodo, path, metodo, constructivas[nombre],
+                                          semilla_metodo(nombre, metodo, seed))
+            for nombre, path in archivos.items()
+            for metodo in METODOS
+        }
+        soluciones = {clave: fut.result() for clave, fut in futuros.items()}
+
+    return {
+        nombre: armar_resultados(path, {metodo: soluciones[(nombre, metodo)] for metodo in METODOS})
+        for nombre, path in archivos.items()
+    }
 
 
 # ======================================================
@@ -176,10 +225,10 @@ def procesar_todas_las_instancias(instances_folder="instances"):
 # ======================================================
 
 def guardar_resultados_en_excel(resultados, output_folder="resultados"):
-    os.makedirs(output_folder, exist_ok=True)
-    metodos = ["constructive", "randomized", "annealing", "vns", "local_search"]
+    import pandas as pd
 
-    for metodo in metodos:
+    os.makedirs(output_folder, exist_ok=True)
+    for metodo in METODOS:
         metodo_dir = os.path.join(output_folder, metodo)
         os.makedirs(metodo_dir, exist_ok=True)
 
@@ -204,9 +253,13 @@ def guardar_resultados_en_excel(resultados, output_folder="resultados"):
 # MAIN
 # ======================================================
 
-if __name__ == "__main__":
+def main(instances_folder="instances", output_folder="resultados", workers=None, seed=0):
     print("🚀 Iniciando procesamiento de instancias...\n")
-    resultados = procesar_todas_las_instancias()
+    resultados = procesar_todas_las_instancias(instances_folder, workers=workers, seed=seed)
     print("\n📊 Generando archivos Excel...")
-    guardar_resultados_en_excel(resultados)
-    print("\n✅ Proceso completado correctamente. Archivos disponibles en la carpeta 'resultados/'.")
+    guardar_resultados_en_excel(resultados, output_folder)
+    print(f"\n✅ Proceso completado correctamente. Archivos disponibles en la carpeta '{output_folder}/'.")
+
+
+if __name__ == "__main__":
+    main()
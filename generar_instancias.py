@@ -0,0 +1,123 @@
+import argparse
+import json
+import os
+from typing import Dict, List
+
+import numpy as np
+
+DIAS = ["L", "Ma", "Mi", "J", "V"]
+
+
+# =========================
+# Generador de instancias sintéticas
+# =========================
+def _repartir(n: int, partes: int) -> List[int]:
+    """Reparte n elementos en 'partes' bloques casi iguales (los primeros reciben el sobrante)."""
+    base, extra = divmod(n, partes)
+    return [base + (1 if i < extra else 0) for i in range(partes)]
+
+
+def generar_instancia(n_empleados: int,
+                      n_zonas: int,
+                      n_grupos: int,
+                      n_escritorios: int = None,
+                      holgura: float = 0.45,
+                      densidad_escritorios: float = 0.5,
+                      densidad_dias: float = 0.5,
+                      seed: int = 0) -> Dict:
+    """
+    Genera una instancia con el mismo esquema que instances/instanceN.json.
+    - holgura: escritorios/empleados (solo se usa si no se da n_escritorios)
+    - densidad_escritorios: fracción esperada de escritorios que le gustan a cada empleado
+    - densidad_dias: probabilidad de que a un empleado le guste cada día
+    Cada empleado tiene al menos un escritorio y un día preferido. Misma semilla -> mismo JSON.
+    """
+    if n_escritorios is None:
+        n_escritorios = max(1, int(round(holgura * n_empleados)))
+    if not (1 <= n_zonas <= n_escritorios):
+        raise ValueError("n_zonas debe estar entre 1 y n_escritorios")
+    if not (1 <= n_grupos <= n_empleados):
+        raise ValueError("n_grupos debe estar entre 1 y n_empleados")
+    if not (0.0 <= densidad_escritorios <= 1.0 and 0.0 <= densidad_dias <= 1.0):
+        raise ValueError("las densidades deben estar en [0, 1]")
+
+    rng = np.random.default_rng(seed)
+
+    employees = [f"E{i}" for i in range(n_empleados)]
+    desks = [f"D{i}" for i in range(n_escritorios)]
+    groups = [f"G{i}" for i in range(n_grupos)]
+    zones = [f"Z{i}" for i in range(n_zonas)]
+
+    desks_z, inicio = {}, 0
+    for z, k in zip(zones, _repartir(n_escritorios, n_zonas)):
+        desks_z[z] = desks[inicio:inicio + k]
+        inicio += k
+
+    employees_g, inicio = {}, 0
+    for g, k in zip(groups, _repartir(n_empleados, n_grupos)):
+        employees_g[g] = employees[inicio:inicio + k]
+        inicio += k
+
+    n_gustos = np.maximum(rng.binomial(n_escritorios, densidad_escritorios, size=n_empleados), 1)
+    desks_e = {
+        e: [desks[d] for d in rng.choice(n_escritorios, size=int(k), replace=False)]
+        for e, k in zip(employees, n_gustos)
+    }
+
+    gusta_dia = rng.random((n_empleados, len(DIAS))) < densidad_dias
+    sin_dia = np.flatnonzero(~gusta_dia.any(axis=1))
+    gusta_dia[sin_dia, rng.integers(len(DIAS), size=len(sin_dia))] = True
+    days_e = {e: [DIAS[t] for t in np.flatnonzero(fila)] for e, fila in zip(employees, gusta_dia)}
+
+    return {
+        "Employees": employees,
+        "Desks": desks,
+        "Days": list(DIAS),
+        "Groups": groups,
+        "Zones": zones,
+        "Desks_Z": desks_z,
+        "Desks_E": desks_e,
+        "Employees_G": employees_g,
+        "Days_E": days_e,
+    }
+
+
+def guardar_instancia(instance: Dict, path_json: str):
+    carpeta = os.path.dirname(path_json)
+    if carpeta:
+        os.makedirs(carpeta, exist_ok=True)
+    with open(path_json, "w", encoding="utf-8") as f:
+        json.dump(instance, f, indent=4, ensure_ascii=False)
+
+
+# ======================================================
+# MAIN
+# ======================================================
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Genera instancias sintéticas grandes con el esquema de instances/.")
+    parser.add_argument("--empleados", type=int, required=True)
+    parser.add_argument("--zonas", type=int, required=True)
+    parser.add_argument("--grupos", type=int, required=True)
+    parser.add_argument("--escritorios", type=int, default=None, help="si se omite, se usa --holgura")
+    parser.add_argument("--holgura", type=float, default=0.45, help="escritorios/empleados")
+    parser.add_argument("--densidad-escritorios", type=float, default=0.5)
+    parser.add_argument("--densidad-dias", type=float, default=0.5)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("-o", "--salida", default=None,
+                        help="por defecto instances/generadas/instance_<empleados>_s<seed>.json")
+    args = parser.parse_args()
+
+    inst = generar_instancia(
+        n_empleados=args.empleados,
+        n_zonas=args.zonas,
+        n_grupos=args.grupos,
+        n_escritorios=args.escritorios,
+        holgura=args.holgura,
+        densidad_escritorios=args.densidad_escritorios,
+        densidad_dias=args.densidad_dias,
+        seed=args.seed,
+    )
+    salida = args.salida or os.path.join("instances", "generadas", f"instance_{args.empleados}_s{args.seed}.json")
+    guardar_instancia(inst, salida)
+    print(f"✅ Instancia generada: {salida} ({len(inst['Employees'])} empleados, {len(inst['Desks'])} escritorios)")
@@ -0,0 +1,194 @@
+import heapq
+from collections import deque
+from typing import List, Sequence, Tuple
+
+INF = float("inf")
+
+
+# =========================
+# Emparejamiento bipartito máximo (Hopcroft–Karp)
+# =========================
+def hopcroft_karp(adj: Sequence[Sequence[int]],
+                  n_right: int,
+                  match_l: List[int] = None,
+                  match_r: List[int] = None) -> Tuple[int, List[int], List[int]]:
+    """
+    Emparejamiento máximo entre la izquierda 0..len(adj)-1 y la derecha 0..n_right-1,
+    con adj[u] = vecinos de u. O(E·sqrt(V)); el DFS es iterativo (sin límite de recursión).
+    match_l / match_r permiten partir de un emparejamiento previo: los caminos aumentantes
+    solo reacomodan a los ya emparejados, nunca los sueltan.
+    Devuelve (tamaño, match_l, match_r) con -1 para los libres.
+    """
+    n_left = len(adj)
+    if match_l is None:
+        match_l = [-1] * n_left
+    if match_r is None:
+        match_r = [-1] * n_right
+    dist = [0] * n_left
+
+    while True:
+        # BFS por capas desde los libres de la izquierda
+        q = deque()
+        for u in range(n_left):
+            if match_l[u] == -1:
+                dist[u] = 0
+                q.append(u)
+            else:
+                dist[u] = INF
+        hay_camino = False
+        while q:
+            u = q.popleft()
+            for v in adj[u]:
+                w = match_r[v]
+                if w == -1:
+                    hay_camino = True
+                elif dist[w] == INF:
+                    dist[w] = dist[u] + 1
+                    q.append(w)
+        if not hay_camino:
+            break
+
+        # DFS por capas: caminos aumentantes disjuntos
+        it = [0] * n_left
+        for s in range(n_left):
+            if match_l[s] != -1:
+                continue
+            stack = [s]
+            while stack:
+                u = stack[-1]
+                if it[u] < len(adj[u]):
+                    v = adj[u][it[u]]
+                    it[u] += 1
+                    w = match_r[v]
+                    if w == -1:
+                        # invertir el camino: cada u de la pila toma el v por el que bajó
+                        for x in stack:
+                            vx = adj[x][it[x] - 1]
+                            match_l[x] = vx
+                            match_r[vx] = x
+                        break
+                    if dist[w] == dist[u] + 1:
+                        stack.append(w)
+                else:
+                    dist[u] = INF   # sin salida en esta fase
+                    stack.pop()
+
+    return sum(1 for v in match_l if v != -1), match_l, match_r
+
+
+# =========================
+# Flujo de costo mínimo
+# =========================
+class RedFlujo:
+    """
+    Red para flujo de costo mínimo por primal-dual: Dijkstra con potenciales y, en cada
+    fase, flujo bloqueante (Dinic) sobre los arcos de costo reducido 0. Hay una fase por
+    cada costo de camino distinto, no una por unidad de flujo, así que con costos chicos
+    el número de Dijkstras no crece con el flujo. Los costos iniciales deben ser >= 0.
+    """
+
+    def __init__(self, n: int):
+        self.n = n
+        self.g: List[List[list]] = [[] for _ in range(n)]   # arco: [destino, cap, costo, índice del reverso]
+
+    def arco(self, u: int, v: int, cap: int, costo: int) -> Tuple[int, int]:
+        """Agrega u->v y devuelve una referencia para consultar su flujo."""
+        self.g[u].append([v, cap, costo, len(self.g[v])])
+        self.g[v].append([u, 0, -costo, len(self.g[u]) - 1])
+        return u, len(self.g[u]) - 1
+
+    def flujo_en(self, ref: Tuple[int, int]) -> int:
+        u, i = ref
+        v, _, _, j = self.g[u][i]
+        return self.g[v][j][1]
+
+    def _distancias(self, s: int, pot: List[int]) -> List[float]:
+        """Dijkstra con costos reducidos (>= 0 gracias a los potenciales)."""
+        g = self.g
+        dist = [INF] * self.n
+        dist[s] = 0
+        pq = [(0, s)]
+        while pq:
+            du, u = heapq.heappop(pq)
+            if du > dist[u]:
+                continue
+            pu = pot[u]
+            for v, cap, c, _ in g[u]:
+                if cap > 0:
+                    nd = du + c + pu - pot[v]
+                    if nd < dist[v]:
+                        dist[v] = nd
+                        heapq.heappush(pq, (nd, v))
+        return dist
+
+    def _niveles(self, s: int, t: int, pot: List[int]) -> List[int]:
+        """BFS por arcos admisibles (cap > 0 y costo reducido 0); -1 = inalcanzable."""
+        g = self.g
+        nivel = [-1] * self.n
+        nivel[s] = 0
+        q = deque([s])
+        while q:
+            u = q.popleft()
+            pu = pot[u]
+            for v, cap, c, _ in g[u]:
+                if cap > 0 and nivel[v] < 0 and c + pu - pot[v] == 0:
+                    nivel[v] = nivel[u] + 1
+                    q.append(v)
+        return nivel
+
+    def _aumentar(self, s: int, t: int, pot: List[int], nivel: List[int], it: List[int], tope) -> Tuple[int, int]:
+        """Un camino admisible por niveles (DFS iterativo con arco actual); devuelve (flujo, costo)."""
+        g = self.g
+        stack = [s]
+        while stack:
+            u = stack[-1]
+            if u == t:
+                f = tope
+                for x in stack[:-1]:
+                    f = min(f, g[x][it[x]][1])
+                costo = 0
+                for x in stack[:-1]:
+                    arco = g[x][it[x]]
+                    arco[1] -= f
+                    g[arco[0]][arco[3]][1] += f
+                    costo += f * arco[2]
+                return f, costo
+            arcos, pu, nu = g[u], pot[u], nivel[u] + 1
+            while it[u] < len(arcos):
+                v, cap, c, _ = arcos[it[u]]
+                if cap > 0 and nivel[v] == nu and c + pu - pot[v] == 0:
+                    stack.append(v)
+                    break
+                it[u] += 1
+            else:
+                nivel[u] = -1   # sin salida en esta fase
+                stack.pop()
+                if stack:
+                    it[stack[-1]] += 1
+        return 0, 0
+
+    def flujo(self, s: int, t: int, max_flujo: int = None) -> Tuple[int, int]:
+        """Envía hasta max_flujo unidades de s a t con costo mínimo; devuelve (flujo, costo)."""
+        pot = [0] * self.n
+        total = costo = 0
+        while max_flujo is None or total < max_flujo:
+            dist = self._distancias(s, pot)
+            if dist[t] == INF:
+                break
+            for v in range(self.n):
+                if dist[v] < INF:
+                    pot[v] += dist[v]
+            # fase: todos los caminos más cortos de una vez (Dinic en el subgrafo admisible)
+            while max_flujo is None or total < max_flujo:
+                nivel = self._niveles(s, t, pot)
+                if nivel[t] < 0:
+                    break
+                it = [0] * self.n
+                while max_flujo is None or total < max_flujo:
+                    f, c = self._aumentar(s, t, pot, nivel, it,
+                                          INF if max_flujo is None else max_flujo - total)
+                    if not f:
+                        break
+                    total += f
+                    costo += c
+        return total, costo
@@ -0,0 +1,269 @@
+import random
+import time
+from typing import Dict, List, Tuple
+
+from instancia import CompiledInstance, como_instancia
+from indices import IndiceOcupacion
+from metodo_constructivo import DIA, repartir_zonas
+from metodo_constructivo_aleatorio import _precalculo, semilla_corrida
+from evaluacion_incremental import EvaluadorIncremental
+from solucion_array import LIBRE, SolucionArray
+
+
+# =========================
+# Lista restringida de candidatos
+# =========================
+def elegir_rcl(candidatos: List, valores: List[float], alpha: float, rng: random.Random):
+    """
+    GRASP: elige al azar entre los candidatos con valor >= max - alpha·(max - min).
+    alpha = 0 -> greedy puro (empates al azar); alpha = 1 -> totalmente aleatorio.
+    """
+    hi, lo = max(valores), min(valores)
+    umbral = hi - alpha * (hi - lo)
+    return rng.choice([c for c, v in zip(candidatos, valores) if v >= umbral])
+
+
+# =========================
+# Construcción greedy aleatorizada
+# =========================
+def grasp_dias_reunion(ci: CompiledInstance, alpha: float, rng: random.Random) -> Dict[str, str]:
+    """Día de reunión por grupo: RCL sobre los gustos grupo-día entre los días con cupo."""
+    gdp = _precalculo(ci)["gdp"]
+    cap_total = _precalculo(ci)["total"]
+    carga = {d: 0 for d in ci.days}
+
+    groups = list(ci.groups)
+    rng.shuffle(groups)   # empates de pico al azar (el sort es estable)
+    groups.sort(key=lambda g: max(gdp[g].values()), reverse=True)
+
+    groups_days = {}
+    for g in groups:
+        size = len(ci.employees_g[g])
+        cand = [d for d in ci.days if carga[d] + size <= cap_total]
+        if cand:
+            d = elegir_rcl(cand, [gdp[g][d] for d in cand], alpha, rng)
+        else:
+            d = max(ci.days, key=lambda d: cap_total - carga[d])   # fallback: mayor remanente
+        carga[d] += size
+        groups_days[g] = d
+    return groups_days
+
+
+def grasp_segundo_dia(ci: CompiledInstance, groups_days: Dict[str, str], alpha: float,
+                      rng: random.Random) -> Dict[str, str]:
+    """Segundo día por empleado: RCL que valora el gusto y, luego, la holgura del día."""
+    cap_total = _precalculo(ci)["total"]
+    cap = {d: cap_total for d in ci.days}
+    for g, d in groups_days.items():
+        cap[d] -= len(ci.employees_g[g])
+
+    order = list(ci.days_e)
+    rng.shuffle(order)
+    second_day = {}
+    for e in order:
+        gday = groups_days[ci.emp_to_group[e]]
+        cand = [d for d in ci.days if d != gday and cap[d] > 0]
+        if not cand:
+            continue
+        liked = ci.days_e_set.get(e, frozenset())
+        d = elegir_rcl(cand, [(d in liked) + cap[d] / max(cap_total, 1) for d in cand], alpha, rng)
+        second_day[e] = d
+        cap[d] -= 1
+    return second_day
+
+
+def grasp_sentar_dia(ci: CompiledInstance, employees_day: List[str], alpha: float,
+                     rng: random.Random) -> Dict[str, str]:
+    """
+    Asientos de un día. Zona objetivo con repartir_zonas (orden de llegada al azar) y, por
+    empleado, RCL sobre 4 clases de escritorio libre: gusto en su zona (3), gusto en otra
+    zona (2), cualquiera en su zona (1), cualquiera (0).
+    """
+    gustos_z = _precalculo(ci)["gustos_por_zona"]
+    emps = list(employees_day)
+    rng.shuffle(emps)
+    target = repartir_zonas(emps, ci.desks_z, ci.emp_to_group, tuple(ci.zones))
+    libres = IndiceOcupacion(ci.desks_z, [DIA])
+    total_libres = sum(len(ds) for ds in ci.desks_z.values())
+
+    assignment = {}
+    for e in emps:
+        z = target.get(e)
+        propios = [d for d in gustos_z[e].get(z, ()) if libres.esta_libre(DIA, d)]
+        otros = [d for zz, ds in gustos_z[e].items() if zz != z for d in ds if libres.esta_libre(DIA, d)]
+        clases = [(3, len(propios)), (2, len(otros)),
+                  (1, libres.n_libres(DIA, z) if z is not None else 0),
+                  (0, total_libres)]
+        clases = [(c, n) for c, n in clases if n]
+        if not clases:
+            continue   # sin sillas globales
+        hi, lo = clases[0][0], clases[-1][0]
+        umbral = hi - alpha * (hi - lo)
+        clases = [(c, n) for c, n in clases if c >= umbral]
+        r = rng.randrange(sum(n for _, n in clases))
+        for c, n in clases:
+            if r < n:
+                break
+            r -= n
+        if c == 3:
+            d = propios[r]
+        elif c == 2:
+            d = otros[r]
+        elif c == 1:
+            d = libres.elegir_libre(DIA, z, rng)
+        else:
+            d = libres.elegir_libre(DIA, None, rng)
+        assignment[e] = d
+        libres.ocupar(DIA, d)
+        total_libres -= 1
+    return assignment
+
+
+def grasp_construir(ci: CompiledInstance, alpha: float, rng: random.Random):
+    """Una construcción GRASP completa: (solución en formato dict, groups_days)."""
+    groups_days = grasp_dias_reunion(ci, alpha, rng)
+    second_day = grasp_segundo_dia(ci, groups_days, alpha, rng)
+
+    schedule = {d: [] for d in ci.days}
+    for e in ci.days_e:
+        gday = groups_days[ci.emp_to_group[e]]
+        schedule[gday].append(e)
+        d2 = second_day.get(e)
+        if d2 and d2 != gday:
+            schedule[d2].append(e)
+
+    sol = {d: {z: [] for z in ci.desks_z} for d in ci.days}
+    for d in ci.days:
+        for e, desk in grasp_sentar_dia(ci, schedule[d], alpha, rng).items():
+            sol[d][ci.zone_of[desk]].append((desk, e))
+    return sol, groups_days
+
+
+# =========================
+# Mejora local rápida (delta + movimientos en sitio)
+# =========================
+def mejora_local(sa: SolucionArray, ev: EvaluadorIncremental, dia_reunion: List[int],
+                 rng: random.Random, max_sin_mejora: int = 300) -> Tuple[int, int, int]:
+    """
+    First-improvement por muestreo: reasignar escritorio, intercambiar con otro del mismo
+    día o cambiar el segundo día. Cada vecino se evalúa con el delta y solo se aplica si
+    mejora; termina tras max_sin_mejora intentos seguidos sin mejora.
+    """
+    ci = sa.ci
+    T, D, E = ci.n_days, ci.n_desks, ci.n_employees
+    gustos = _precalculo(ci)["gustos_idx"]
+    ocup, esc = sa.ocupante, sa.escritorio
+
+    def destino(e, t):
+        libres = [d for d in gustos[e] if ocup[t, d] == LIBRE]
+        if libres:
+            return rng.choice(libres)
+        libres = sa.libres(t)
+        return int(libres[rng.randrange(len(libres))]) if len(libres) else None
+
+    fallas = 0
+    while fallas < max_sin_mejora:
+        fallas += 1
+        e = rng.randrange(E)
+        dias = [t for t in range(T) if esc[e, t] != LIBRE]
+        if not dias:
+            continue
+        r = rng.random()
+        if r < 0.4:     # otro escritorio el mismo día
+            t = rng.choice(dias)
+            d0, d1 = int(esc[e, t]), destino(e, t)
+            if d1 is None:
+                continue
+            if ev.delta_mover(e, t, d0, t, d1) < (0, 0, 0):
+                ev.aplicar(*sa.mover(e, t, t, d1))
+                fallas = 0
+        elif r < 0.7:   # intercambio con quien ocupa otro escritorio ese día
+            t = rng.choice(dias)
+            d0, d1 = int(esc[e, t]), rng.randrange(D)
+            e2 = int(ocup[t, d1])
+            if e2 == LIBRE or e2 == e:
+                continue
+            if ev.delta_intercambio(t, d0, e, t, d1, e2) < (0, 0, 0):
+                ev.aplicar(*sa.intercambiar(t, d0, t, d1))
+                fallas = 0
+        else:           # cambiar el segundo día
+            movibles = [t for t in dias if t != dia_reunion[e]]
+            destinos = [t for t in range(T) if esc[e, t] == LIBRE and t != dia_reunion[e]]
+            if not movibles or not destinos:
+                continue
+            t0, t1 = rng.choice(movibles), rng.choice(destinos)
+            d1 = destino(e, t1)
+            if d1 is None:
+                continue
+            if ev.delta_mover(e, t0, int(esc[e, t0]), t1, d1) < (0, 0, 0):
+                ev.aplicar(*sa.mover(e, t0, t1, d1))
+                fallas = 0
+    sa.confirmar()
+    return ev.puntaje()
+
+
+# =========================
+# GRASP
+# =========================
+def _grasp_inicio(ci: CompiledInstance, alpha: float, semilla: int, max_sin_mejora: int):
+    """Construcción + mejora local de un inicio; devuelve (score, sol dict, groups_days)."""
+    rng = random.Random(semilla)
+    sol, groups_days = grasp_construir(ci, alpha, rng)
+    sa = SolucionArray.desde_dict(ci, sol)
+    ev = EvaluadorIncremental.desde_array(sa)
+    dia_reunion = [LIBRE] * ci.n_employees
+    for e, i in ci.emp_idx.items():
+        g = ci.emp_to_group.get(e)
+        if g in groups_days:
+            dia_reunion[i] = ci.day_idx[groups_days[g]]
+    score = mejora_local(sa, ev, dia_reunion, rng, max_sin_mejora)
+    return score, sa, groups_days
+
+
+def _grasp_proceso(instance, alpha: float, seed: int, inicios: range, tiempo_s: float,
+                   max_sin_mejora: int):
+    """Corre los inicios asignados hasta agotarlos o agotar el tiempo."""
+    ci = como_instancia(instance)
+    fin = None if tiempo_s is None else time.perf_counter() + tiempo_s
+    mejor = None
+    scores = []
+    for j in inicios:
+        if fin is not None and scores and time.perf_counter() > fin:
+            break
+        score, sa, groups_days = _grasp_inicio(ci, alpha, semilla_corrida(seed, j), max_sin_mejora)
+        scores.append((j, score))
+        if mejor is None or (score, j) < mejor[:2]:
+            mejor = (score, j, sa.a_dict(), groups_days)
+    return mejor, scores
+
+
+def grasp_assignments(instance, alpha: float = 0.3, tiempo_s: float = 10.0, max_inicios: int = None,
+                      seed: int = 0, workers: int = None, max_sin_mejora: int = 300):
+    """
+    GRASP: construcción greedy aleatorizada (RCL con alpha en día de reunión, segundo día
+    y escritorio) + mejora local con evaluación incremental, repetida hasta agotar
+    tiempo_s o max_inicios (al menos un inicio). El inicio j usa semilla_corrida(seed, j);
+    con workers > 1 los inicios se reparten entre procesos (j ≡ w mod workers).
+    Devuelve (best_solution, best_score, trace) como los demás métodos; trace es el mejor
+    puntaje acumulado tras cada inicio, en orden de j.
+    """
+    ci = como_instancia(instance)
+    if tiempo_s is None and max_inicios is None:
+        raise ValueError("hace falta tiempo_s o max_inicios")
+    tope = max_inicios if max_inicios is not None else 2**62
+
+    if workers and workers > 1:
+        from concurrent.futures import ProcessPoolExecutor
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            partes = list(pool.map(_grasp_proceso, [ci.raw] * workers, [alpha] * workers, [seed] * workers,
+                                   [range(w, tope, workers) for w in range(workers)],
+                                   [tiempo_s] * workers, [max_sin_mejora] * workers))
+    else:
+        partes = [_grasp_proceso(ci, alpha, seed, range(tope), tiempo_s, max_sin_mejora)]
+
+    mejor = min((m for m, _ in partes if m is not None), key=lambda m: m[:2])
+    trace, acumulado = [], None
+    for _, score in sorted(s for _, scores in partes for s in scores):
+        acumulado = score if acumulado is None else min(acumulado, score)
+        trace.append(acumulado)
+    return mejor[2], mejor[0], trace
@@ -0,0 +1,245 @@
+import heapq
+import random
+from typing import Dict, Hashable, Iterable, List, Optional, Tuple
+
+
+# =========================
+# Índice de escritorios libres
+# =========================
+class IndiceOcupacion:
+    """
+    Escritorios libres por (día, zona) para la solución en formato dict.
+    - libres[(día, zona)]: lista de escritorios libres (orden arbitrario)
+    - pos[(día, zona)]: escritorio -> posición en esa lista
+    Ocupar y liberar son O(1) (swap con el último); elegir uno al azar es O(1).
+    primero_libre respeta el orden de Desks_Z con un heap de posiciones que se
+    limpia de forma perezosa (O(log n) amortizado); en_heap evita posiciones repetidas,
+    así que el heap nunca pasa del tamaño de la zona.
+
+    Quien mueve asignaciones en la solución debe llamar a ocupar/liberar con el
+    mismo día y escritorio; copy() sirve para acompañar un copy.deepcopy(sol).
+    """
+
+    def __init__(self, desks_z: Dict[str, List[str]], days: Iterable[Hashable] = ()):
+        self.desks_z = desks_z
+        self.zone_of = {d: z for z, ds in desks_z.items() for d in ds}
+        self.orden = {d: i for ds in desks_z.values() for i, d in enumerate(ds)}
+        self.libres: Dict[Tuple[Hashable, str], List[str]] = {}
+        self.pos: Dict[Tuple[Hashable, str], Dict[str, int]] = {}
+        self.heap: Dict[Tuple[Hashable, str], List[int]] = {}
+        self.en_heap: Dict[Tuple[Hashable, str], set] = {}
+        for day in days:
+            self.agregar_dia(day)
+
+    @classmethod
+    def desde_solucion(cls, desks_z: Dict[str, List[str]],
+                       sol: Dict[str, Dict[str, List[Tuple[str, str]]]]) -> "IndiceOcupacion":
+        idx = cls(desks_z, sol.keys())
+        for day, zonas in sol.items():
+            for asignaciones in zonas.values():
+                for desk, _ in asignaciones:
+                    idx.ocupar(day, desk)
+        return idx
+
+    def agregar_dia(self, day: Hashable):
+        for z, ds in self.desks_z.items():
+            self.libres[day, z] = list(ds)
+            self.pos[day, z] = {d: i for i, d in enumerate(ds)}
+            self.heap[day, z] = list(range(len(ds)))   # ya es un heap
+            self.en_heap[day, z] = set(range(len(ds)))
+
+    def copy(self) -> "IndiceOcupacion":
+        out = IndiceOcupacion.__new__(IndiceOcupacion)
+        out.desks_z = self.desks_z
+        out.zone_of = self.zone_of
+        out.orden = self.orden
+        out.libres = {k: v[:] for k, v in self.libres.items()}
+        out.pos = {k: dict(v) for k, v in self.pos.items()}
+        out.heap = {k: v[:] for k, v in self.heap.items()}
+        out.en_heap = {k: set(v) for k, v in self.en_heap.items()}
+        return out
+
+    # -------------------------
+    # Consultas
+    # -------------------------
+    def esta_libre(self, day: Hashable, desk: str) -> bool:
+        """False también para escritorios que no pertenecen a ninguna zona."""
+        z = self.zone_of.get(desk)
+        return z is not None and desk in self.pos[day, z]
+
+    def n_libres(self, day: Hashable, zone: str) -> int:
+        return len(self.libres[day, zone])
+
+    def zonas_con_libres(self, day: Hashable, zones: Iterable[str] = None) -> List[str]:
+        return [z for z in (zones if zones is not None else self.desks_z) if self.libres[day, z]]
+
+    def elegir_libre(self, day: Hashable, zone: str = None, rng=random) -> Optional[str]:
+        """Escritorio libre al azar de la zona (o de todo el día si zone es None)."""
+        if zone is not None:
+            ls = self.libres[day, zone]
+            return ls[rng.randrange(len(ls))] if ls else None
+        total = sum(len(self.libres[day, z]) for z in self.desks_z)
+        if total == 0:
+            return None
+        r = rng.randrange(total)
+        for z in self.desks_z:
+            ls = self.libres[day, z]
+            if r < len(ls):
+                return ls[r]
+            r -= len(ls)
+
+    def primero_libre(self, day: Hashable, zone: str) -> Optional[str]:
+        """Primer escritorio libre de la zona en el orden de Desks_Z."""
+        h = self.heap[day, zone]
+        ds = self.desks_z[zone]
+        libres = self.pos[day, zone]
+        while h and ds[h[0]] not in libres:
+            self.en_heap[day, zone].discard(heapq.heappop(h))
+        return ds[h[0]] if h else None
+
+    # -------------------------
+    # Actualización
+    # -------------------------
+    def ocupar(self, day: Hashable, desk: str):
+        z = self.zone_of[desk]
+        pos = self.pos[day, z]
+        i = pos.pop(desk, None)
+        if i is None:
+            raise ValueError(f"El escritorio {desk} ya está ocupado el día {day}")
+        ls = self.libres[day, z]
+        ultimo = ls.pop()
+        if ultimo != desk:
+            ls[i] = ultimo
+            pos[ultimo] = i
+
+    def liberar(self, day: Hashable, desk: str):
+        z = self.zone_of[desk]
+        pos = self.pos[day, z]
+        if desk in pos:
+            raise ValueError(f"El escritorio {desk} ya está libre el día {day}")
+        ls = self.libres[day, z]
+        pos[desk] = len(ls)
+        ls.append(desk)
+        i = self.orden[desk]
+        en_heap = self.en_heap[day, z]
+        if i not in en_heap:   # si sigue en el heap (obsoleta), vuelve a ser válida
+            en_heap.add(i)
+            heapq.heappush(self.heap[day, z], i)
+
+
+# =========================
+# Índice inverso empleado -> ubicaciones
+# =========================
+Ubicacion = Tuple[Hashable, str, int]   # (día, zona, slot en sol[día][zona])
+
+
+class IndiceEmpleados:
+    """
+    Índice inverso de la solución en formato dict: empleado -> [(día, zona, slot)],
+    con slot la posición de su tupla en sol[día][zona]. Ubicar a un empleado es O(1)
+    (sus ubicaciones son tantas como días asiste).
+
+    agregar, quitar y poner modifican sol y el índice a la vez, así que los
+    operadores de movimiento los usan en lugar de tocar las listas directamente.
+    quitar conserva el orden de la lista (como pop) y renumera los slots siguientes
+    de esa zona: O(tamaño de la zona), nunca O(total de asignaciones).
+    """
+
+    def __init__(self):
+        self.ubic: Dict[str, List[Ubicacion]] = {}
+
+    @classmethod
+    def desde_solucion(cls, sol: Dict[str, Dict[str, List[Tuple[str, str]]]]) -> "IndiceEmpleados":
+        idx = cls()
+        for day, zonas in sol.items():
+            for zone, asignaciones in zonas.items():
+                for slot, (_, emp) in enumerate(asignaciones):
+                    idx.ubic.setdefault(emp, []).append((day, zone, slot))
+        return idx
+
+    def copy(self) -> "IndiceEmpleados":
+        out = IndiceEmpleados.__new__(IndiceEmpleados)
+        out.ubic = {e: v[:] for e, v in self.ubic.items()}
+        return out
+
+    # -------------------------
+    # Consultas
+    # -------------------------
+    def ubicaciones(self, emp: str) -> List[Ubicacion]:
+        return self.ubic.get(emp, [])
+
+    def dias(self, emp: str) -> List[Hashable]:
+        """Días distintos en los que está el empleado."""
+        return list(dict.fromkeys(d for d, _, _ in self.ubicaciones(emp)))
+
+    def asiste(self, emp: str, day: Hashable) -> bool:
+        return any(d == day for d, _, _ in self.ubicaciones(emp))
+
+    def apariciones(self, emp: str, day: Hashable) -> int:
+        return sum(d == day for d, _, _ in self.ubicaciones(emp))
+
+    def slots(self, emp: str, day: Hashable, zone: str) -> List[int]:
+        """Posiciones del empleado en sol[day][zone], de menor a mayor."""
+        return sorted(i for d, z, i in self.ubicaciones(emp) if d == day and z == zone)
+
+    # -------------------------
+    # Actualización (sobre sol y el índice)
+    # -------------------------
+    def _sacar(self, emp: str, ubicacion: Ubicacion):
+        ls = self.ubic[emp]
+        ls.remove(ubicacion)
+        if not ls:
+            del self.ubic[emp]
+
+    def agregar(self, sol, day: Hashable, zone: str, desk: str, emp: str):
+        lista = sol[day][zone]
+        self.ubic.setdefault(emp, []).append((day, zone, len(lista)))
+        lista.append((desk, emp))
+
+    def quitar(self, sol, day: Hashable, zone: str, slot: int) -> Tuple[str, str]:
+        """Quita la asignación en ese slot (como list.pop) y devuelve (escritorio, empleado)."""
+        lista = sol[day][zone]
+        desk, emp = lista.pop(slot)
+        self._sacar(emp, (day, zone, slot))
+        for i in range(slot, len(lista)):
+            ls = self.ubic[lista[i][1]]
+            ls[ls.index((day, zone, i + 1))] = (day, zone, i)
+        return desk, emp
+
+    def quitar_empleado(self, sol, day: Hashable, zone: str, emp: str) -> List[str]:
+        """Quita todas las asignaciones de emp en sol[day][zone]; devuelve sus escritorios en orden de lista."""
+        slots = self.slots(emp, day, zone)
+        desks = [sol[day][zone][i][0] for i in slots]
+        for i in reversed(slots):
+            self.quitar(sol, day, zone, i)
+        return desks
+
+    def poner(self, sol, day: Hashable, zone: str, slot: int, emp: str) -> str:
+        """Sienta a emp en el escritorio del slot en lugar de su ocupante; devuelve el ocupante anterior."""
+        lista = sol[day][zone]
+        desk, antes = lista[slot]
+        self._sacar(antes, (day, zone, slot))
+        lista[slot] = (desk, emp)
+        self.ubic.setdefault(emp, []).append((day, zone, slot))
+        return antes
+
+
+# =========================
+# Verificación
+# =========================
+def verificar_indice(indice: IndiceOcupacion, sol: Dict[str, Dict[str, List[Tuple[str, str]]]]):
+    """Compara el índice con los escritorios realmente ocupados en sol (AssertionError si difieren)."""
+    for day, zonas in sol.items():
+        ocupados = {desk for asignaciones in zonas.values() for desk, _ in asignaciones}
+        for z, ds in indice.desks_z.items():
+            esperado = [d for d in ds if d not in ocupados]
+            assert sorted(indice.libres[day, z]) == sorted(esperado), (day, z)
+            assert indice.primero_libre(day, z) == (esperado[0] if esperado else None), (day, z)
+
+
+def verificar_indice_empleados(indice: IndiceEmpleados, sol: Dict[str, Dict[str, List[Tuple[str, str]]]]):
+    """Compara el índice inverso con sol (AssertionError si difieren)."""
+    esperado = IndiceEmpleados.desde_solucion(sol).ubic
+    assert set(indice.ubic) == set(esperado), "empleados distintos"
+    for emp, ubic in esperado.items():
+        assert sorted(indice.ubic[emp], key=repr) == sorted(ubic, key=repr), emp
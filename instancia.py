@@ -0,0 +1,177 @@
+import json
+import os
+from typing import Dict, Iterable, List, Tuple
+
+import numpy as np
+
+
+# =========================
+# Instancia compilada
+# =========================
+class CompiledInstance:
+    """
+    Instancia construida una sola vez a partir del JSON.
+    - ids enteros densos para días, zonas, escritorios, empleados y grupos
+    - arreglos NumPy: escritorio->zona, empleado->grupo, tamaños de grupo
+    - matrices booleanas empleado×escritorio y empleado×día (gustos)
+    - mapas de strings ya armados (emp->grupo, escritorio->zona) para el código que
+      sigue trabajando con la solución en formato dict
+    """
+
+    def __init__(self, instance: Dict):
+        self.raw = instance
+
+        self.days: List[str] = list(instance["Days"])
+        self.zones: List[str] = list(instance["Zones"])
+        self.desks_z: Dict[str, List[str]] = instance["Desks_Z"]
+        self.desks_e: Dict[str, List[str]] = instance["Desks_E"]
+        self.days_e: Dict[str, List[str]] = instance["Days_E"]
+        self.employees_g: Dict[str, List[str]] = instance["Employees_G"]
+
+        # escritorios en el orden de Desks_Z (así cada zona queda contigua)
+        self.desks: List[str] = [d for z in self.zones for d in self.desks_z.get(z, [])]
+        self.employees: List[str] = list(instance.get("Employees") or self.days_e.keys())
+        self.groups: List[str] = list(self.employees_g.keys())
+
+        self.day_idx = {d: i for i, d in enumerate(self.days)}
+        self.zone_idx = {z: i for i, z in enumerate(self.zones)}
+        self.desk_idx = {d: i for i, d in enumerate(self.desks)}
+        self.emp_idx = {e: i for i, e in enumerate(self.employees)}
+        self.group_idx = {g: i for i, g in enumerate(self.groups)}
+
+        # mapas de strings (reutilizados por los métodos en formato dict)
+        self.emp_to_group = {e: g for g, es in self.employees_g.items() for e in es}
+        self.zone_of = {d: z for z, ds in self.desks_z.items() for d in ds}
+        self.desks_e_set = {e: frozenset(ds or []) for e, ds in self.desks_e.items()}
+        self.days_e_set = {e: frozenset(ds or []) for e, ds in self.days_e.items()}
+
+        n_e, n_d, n_t = len(self.employees), len(self.desks), len(self.days)
+
+        self.desk_zone = np.array([self.zone_idx[self.zone_of[d]] for d in self.desks], dtype=np.int32)
+        self.emp_group = np.full(n_e, -1, dtype=np.int32)   # -1: empleado sin grupo
+        for g, es in self.employees_g.items():
+            for e in es:
+                if e in self.emp_idx:
+                    self.emp_group[self.emp_idx[e]] = self.group_idx[g]
+        self.group_size = np.array([len(self.employees_g[g]) for g in self.groups], dtype=np.int32)
+        self.zone_size = np.bincount(self.desk_zone, minlength=len(self.zones)).astype(np.int32)
+        self.zone_desks = [np.flatnonzero(self.desk_zone == z).astype(np.int32) for z in range(len(self.zones))]
+
+        self.desk_pref = np.zeros((n_e, n_d), dtype=bool)
+        for e, ds in self.desks_e.items():
+            if e not in self.emp_idx:
+                continue
+            for d in ds or []:
+                if d in self.desk_idx:
+                    self.desk_pref[self.emp_idx[e], self.desk_idx[d]] = True
+
+        self.day_pref = np.zeros((n_e, n_t), dtype=bool)
+        for e, ds in self.days_e.items():
+            if e not in self.emp_idx:
+                continue
+            for d in ds or []:
+                if d in self.day_idx:
+                    self.day_pref[self.emp_idx[e], self.day_idx[d]] = True
+
+    @property
+    def n_days(self) -> int:
+        return len(self.days)
+
+    @property
+    def n_zones(self) -> int:
+        return len(self.zones)
+
+    @property
+    def n_desks(self) -> int:
+        return len(self.desks)
+
+    @property
+    def n_employees(self) -> int:
+        return len(self.employees)
+
+    @property
+    def n_groups(self) -> int:
+        return len(self.groups)
+
+    # -------------------------
+    # Conversión en los bordes
+    # -------------------------
+    def solucion_a_asignaciones(self, sol: Dict[str, Dict[str, List[Tuple[str, str]]]]) -> np.ndarray:
+        """Pasa {día: {zona: [(desk, emp)]}} a un arreglo (n, 3) de ids (día, escritorio, empleado)."""
+        filas = [
+            (self.day_idx[day], self.desk_idx[desk], self.emp_idx[emp])
+            for day, zonas in sol.items()
+            for _, asignaciones in zonas.items()
+            for desk, emp in asignaciones
+        ]
+        return np.array(filas, dtype=np.int32).reshape(-1, 3)
+
+    def asignaciones_a_solucion(self, asignaciones: Iterable[Tuple[int, int, int]]) -> Dict[str, Dict[str, List[Tuple[str, str]]]]:
+        """Inverso de solucion_a_asignaciones: ids (día, escritorio, empleado) -> formato dict."""
+        sol = {d: {z: [] for z in self.zones} for d in self.days}
+        for t, d, e in asignaciones:
+            desk = self.desks[int(d)]
+            sol[self.days[int(t)]][self.zone_of[desk]].append((desk, self.employees[int(e)]))
+        return sol
+
+    def groups_days_a_indices(self, groups_days: Dict[str, str]) -> np.ndarray:
+        """Día de reunión por grupo como arreglo de ids (-1 si el grupo no tiene día)."""
+        out = np.full(self.n_groups, -1, dtype=np.int32)
+        for g, d in groups_days.items():
+            out[self.group_idx[g]] = self.day_idx[d]
+        return out
+
+
+# cache ruta -> (mtime, tamaño, instancia); se invalida si el archivo cambia
+_CACHE_INSTANCIAS: Dict[str, Tuple[int, int, CompiledInstance]] = {}
+
+
+def cargar_instancia(path_json: str, usar_cache: bool = True) -> CompiledInstance:
+    """Lee y compila el JSON. Con cache, solo se vuelve a leer si cambian mtime o tamaño."""
+    if not usar_cache:
+        with open(path_json, "r", encoding="utf-8") as f:
+            return CompiledInstance(json.load(f))
+
+    key = os.path.abspath(path_json)
+    st = os.stat(key)
+    hit = _CACHE_INSTANCIAS.get(key)
+    if hit is not None and hit[0] == st.st_mtime_ns and hit[1] == st.st_size:
+        return hit[2]
+
+    with open(key, "r", encoding="utf-8") as f:
+        ci = CompiledInstance(json.load(f))
+    _CACHE_INSTANCIAS[key] = (st.st_mtime_ns, st.st_size, ci)
+    return ci
+
+
+# cache id(dict) -> instancia para quien pasa el dict del JSON; ci.raw mantiene vivo el
+# dict, así que su id no se reutiliza mientras esté en el cache. Se supone que el dict
+# no se modifica después de compilarlo (como el archivo con el cache por ruta).
+_CACHE_DICTS: Dict[int, CompiledInstance] = {}
+_MAX_CACHE_DICTS = 8
+
+
+def compilar_dict(instance: Dict) -> CompiledInstance:
+    """CompiledInstance del dict; el mismo objeto dict se compila una sola vez."""
+    ci = _CACHE_DICTS.get(id(instance))
+    if ci is not None and ci.raw is instance:
+        return ci
+    ci = CompiledInstance(instance)
+    if len(_CACHE_DICTS) >= _MAX_CACHE_DICTS:
+        del _CACHE_DICTS[next(iter(_CACHE_DICTS))]   # el más antiguo
+    _CACHE_DICTS[id(instance)] = ci
+    return ci
+
+
+def limpiar_cache_instancias():
+    _CACHE_INSTANCIAS.clear()
+    _CACHE_DICTS.clear()
+
+
+def como_instancia(instance) -> CompiledInstance:
+    """Acepta una CompiledInstance, el dict del JSON o la ruta del archivo."""
+    if isinstance(instance, CompiledInstance):
+        return instance
+    if isinstance(instance, dict):
+        return compilar_dict(instance)
+    return cargar_instancia(instance)
@@ -1,120 +1,284 @@
-import copy, random
-from score import evaluate_solution
+import random, time
+from score import contadores
 import math
-import json
+from instancia import como_instancia
+from evaluacion_incremental import EvaluadorIncremental
+from solucion_array import LIBRE, SolucionArray
 
 salsa = 0
 
-def mutate_solution(sol, days_e, employees_g, group_meeting_days):
-
-    new_sol = copy.deepcopy(sol)
-
-    move_type = random.choice(["desk", "zone", "day"])
-
-    def get_group(emp):
-        for g, emps in employees_g.items():
-            if emp in emps:
-                return g
-        return None
-
-    # --- 1) Swap dentro de la misma zona y mismo día
-    if move_type == "desk":
-        day = random.choice(list(new_sol.keys()))
-        zone = random.choice(list(new_sol[day].keys()))
-        if len(new_sol[day][zone]) >= 2:
-            i1, i2 = random.sample(range(len(new_sol[day][zone])), 2)
-            (desk1, emp1), (desk2, emp2) = new_sol[day][zone][i1], new_sol[day][zone][i2]
-
-            g1, g2 = get_group(emp1), get_group(emp2)
-            # no tocar si ese día es reunión de alguno de los dos grupos
-            if day not in (group_meeting_days.get(g1), group_meeting_days.get(g2)):
-                new_sol[day][zone][i1] = (desk1, emp2)
-                new_sol[day][zone][i2] = (desk2, emp1)
-
-    # --- 2) Swap entre zonas del mismo día
-    elif move_type == "zone":
-        day = random.choice(list(new_sol.keys()))
-        zones = list(new_sol[day].keys())
-        if len(zones) >= 2:
-            z1, z2 = random.sample(zones, 2)
-            if new_sol[day][z1] and new_sol[day][z2]:
-                i1 = random.randrange(len(new_sol[day][z1]))
-                i2 = random.randrange(len(new_sol[day][z2]))
-                desk1, emp1 = new_sol[day][z1][i1]
-                desk2, emp2 = new_sol[day][z2][i2]
-
-                g1, g2 = get_group(emp1), get_group(emp2)
-                if day not in (group_meeting_days.get(g1), group_meeting_days.get(g2)):
-                    new_sol[day][z1][i1] = (desk1, emp2)
-                    new_sol[day][z2][i2] = (desk2, emp1)
-
-    # --- 3) Swap entre días distintos
-    elif move_type == "day":
-        d1, d2 = random.sample(list(new_sol.keys()), 2)
-        z1 = random.choice(list(new_sol[d1].keys()))
-        z2 = random.choice(list(new_sol[d2].keys()))
-        if new_sol[d1][z1] and new_sol[d2][z2]:
-            i1 = random.randrange(len(new_sol[d1][z1]))
-            i2 = random.randrange(len(new_sol[d2][z2]))
-            desk1, emp1 = new_sol[d1][z1][i1]
-            desk2, emp2 = new_sol[d2][z2][i2]
-
-            g1, g2 = get_group(emp1), get_group(emp2)
-            # si alguno de los días es reunión de alguno de los dos grupos → cancelar
-            if d1 not in (group_meeting_days.get(g1), group_meeting_days.get(g2)) and \
-               d2 not in (group_meeting_days.get(g1), group_meeting_days.get(g2)):
-                # además, que no genere duplicados en los días del empleado
-                if d2 not in days_e[emp1] and d1 not in days_e[emp2]:
-                    new_sol[d1][z1][i1] = (desk1, emp2)
-                    new_sol[d2][z2][i2] = (desk2, emp1)
-
-    return new_sol
+# pesos de (asignaciones, preferencias, aislados): grandes para mantener la prioridad
+PESOS_LEXICOGRAFICOS = (10*6, 10*3, 1)
+
+
+def peso_lexicografico(score):
+    """Puntaje (o delta) ponderado con PESOS_LEXICOGRAFICOS."""
+    w0, w1, w2 = PESOS_LEXICOGRAFICOS
+    return score[0] * w0 + score[1] * w1 + score[2] * w2
+
 
 def lexicographic_delta(score_new, score_old):
     # score = (asignaciones, preferencias, aislados)
-    w = [10*6, 10*3, 1]  # pesos grandes para mantener la prioridad
-    val_new = sum(s * w[i] for i, s in enumerate(score_new))
-    val_old = sum(s * w[i] for i, s in enumerate(score_old))
-    return val_new - val_old
+    return peso_lexicografico(score_new) - peso_lexicografico(score_old)
+
+
+# ============================================
+# MOTOR DE RECOCIDO EN SITIO
+# ============================================
+class MovimientoSA:
+    """
+    Movimiento propuesto: los ocupantes de (t1, d1) y (t2, d2) intercambian lugar
+    (ids de la CompiledInstance). Se evalúa con el delta y solo se aplica si se acepta.
+    """
+    __slots__ = ("tipo", "t1", "d1", "e1", "t2", "d2", "e2")
+
+    def __init__(self, tipo, t1, d1, e1, t2, d2, e2):
+        self.tipo = tipo
+        self.t1, self.d1, self.e1 = t1, d1, e1
+        self.t2, self.d2, self.e2 = t2, d2, e2
+
+    def delta(self, ev):
+        return ev.delta_intercambio(self.t1, self.d1, self.e1, self.t2, self.d2, self.e2)
+
+    def aplicar(self, sol_array, ev):
+        ev.aplicar(*sol_array.intercambiar(self.t1, self.d1, self.t2, self.d2))
+
+
+class ProponedorSA:
+    """
+    Propone movimientos al azar de tres tipos:
+        - "desk": swap dentro de la misma zona y día
+        - "zone": swap entre zonas del mismo día
+        - "day": swap entre días distintos
+    Nunca en el día de reunión de ninguno de los dos y sin repetir un empleado en un día.
+    Todos son intercambios entre escritorios ocupados, así que los ocupados por
+    (día, zona) no cambian y se calculan una vez.
+    """
+
+    TIPOS = ("desk", "zone", "day")
+
+    def __init__(self, sol_array, group_meeting_days, rng=random):
+        ci = sol_array.ci
+        self.rng = rng
+        self.ocupante = sol_array.ocupante
+        self.escritorio = sol_array.escritorio
+        self.n_days, self.n_zones = ci.n_days, ci.n_zones
+        self.ocupados = [[[] for _ in range(ci.n_zones)] for _ in range(ci.n_days)]
+        for t, d, _ in sol_array.asignaciones():
+            self.ocupados[t][ci.desk_zone[d]].append(d)
+        self.dia_reunion = [LIBRE] * ci.n_employees
+        for g, day in group_meeting_days.items():
+            for e in ci.employees_g.get(g, []):
+                self.dia_reunion[ci.emp_idx[e]] = ci.day_idx[day]
+
+    @staticmethod
+    def _par(u, n):
+        """Dos índices distintos de range(n) con un solo par de sorteos (u = rng.random)."""
+        i = int(u() * n)
+        j = int(u() * (n - 1))
+        return i, j + (j >= i)
+
+    def proponer(self):
+        """Un MovimientoSA, o None si el sorteo no da un movimiento válido."""
+        # rng.random() * n en lugar de randrange/choice/sample: es el costo dominante del bucle
+        u = self.rng.random
+        n_days, n_zones = self.n_days, self.n_zones
+        tipo = self.TIPOS[int(u() * 3)]
+        if tipo == "desk":
+            t1 = t2 = int(u() * n_days)
+            ds = self.ocupados[t1][int(u() * n_zones)]
+            if len(ds) < 2:
+                return None
+            i, j = self._par(u, len(ds))
+            d1, d2 = ds[i], ds[j]
+        elif tipo == "zone":
+            if n_zones < 2:
+                return None
+            t1 = t2 = int(u() * n_days)
+            z1, z2 = self._par(u, n_zones)
+            ds1, ds2 = self.ocupados[t1][z1], self.ocupados[t1][z2]
+            if not ds1 or not ds2:
+                return None
+            d1, d2 = ds1[int(u() * len(ds1))], ds2[int(u() * len(ds2))]
+        else:
+            if n_days < 2:
+                return None
+            t1, t2 = self._par(u, n_days)
+            ds1 = self.ocupados[t1][int(u() * n_zones)]
+            ds2 = self.ocupados[t2][int(u() * n_zones)]
+            if not ds1 or not ds2:
+                return None
+            d1, d2 = ds1[int(u() * len(ds1))], ds2[int(u() * len(ds2))]
 
-def simulated_annealing_assignments(initial_solution, group_meeting_days, path_json, iterations=1000, T_init=1.0, cooling_rate=0.99):
-    with open(path_json, "r", encoding="utf-8") as f:
-        instance = json.load(f)
+        e1, e2 = int(self.ocupante[t1, d1]), int(self.ocupante[t2, d2])
+        reunion = (self.dia_reunion[e1], self.dia_reunion[e2])
+        if t1 in reunion or t2 in reunion:
+            return None
+        # que no genere duplicados en los días del empleado
+        if t1 != t2 and (self.escritorio[e1, t2] != LIBRE or self.escritorio[e2, t1] != LIBRE):
+            return None
+        return MovimientoSA(tipo, t1, d1, e1, t2, d2, e2)
 
-    days_e      = instance["Days_E"]
-    employees_g = instance["Employees_G"]
 
-    current_solution = copy.deepcopy(initial_solution)
-    best_solution = current_solution
+def calibrar_temperatura(proponedor, ev, muestras=500, aceptacion=0.1):
+    """
+    Temperatura inicial a partir de movimientos muestreados (sin aplicarlos): la T con
+    la que un empeoramiento promedio se acepta con probabilidad `aceptacion`,
+    T0 = -media(Δ > 0) / ln(aceptacion). Devuelve 1.0 si ningún movimiento empeora.
+    """
+    pesos = []
+    for _ in range(muestras):
+        mov = proponedor.proponer()
+        if mov is not None:
+            peso = peso_lexicografico(mov.delta(ev))
+            if peso > 0:
+                pesos.append(peso)
+    if not pesos:
+        return 1.0
+    return -(sum(pesos) / len(pesos)) / math.log(aceptacion)
 
-    current_score = evaluate_solution(current_solution, path_json)
-    best_score = current_score
 
-    trace = [current_score]
+# enfriamiento por tiempo / adaptativo: se revisa cada BLOQUE iteraciones
+BLOQUE = 256
+T_FINAL_RELATIVA = 1e-3           # por tiempo y adaptativo: T0 -> T0 * T_FINAL_RELATIVA al final
+ACEPTACION_INICIAL = 0.5          # adaptativo: tasa objetivo de aceptación de empeoramientos,
+ACEPTACION_FINAL = 0.005          # interpolada geométricamente según el avance
+ACELERAR = 2.0                    # adaptativo: exponente del factor en bloques demasiado calientes
+PACIENCIA_BLOQUES = 40            # recalentar=True: bloques sin nuevo mejor antes de recalentar
+RECALENTAR = 2.0                  # ... a RECALENTAR · (T con la que se encontró el último mejor)
+
+
+def _volver_a(sol_array, ev, ocupante):
+    """Lleva sol_array (y ev, por delta) a la solución con ese arreglo de ocupantes; devuelve su puntaje."""
+    destino = SolucionArray(sol_array.ci, ocupante.copy())
+    ev.aplicar(sol_array.asignaciones(), destino.asignaciones())
+    sol_array.ocupante[...] = destino.ocupante
+    sol_array.escritorio[...] = destino.escritorio
+    return ev.puntaje()
+
+
+def recocido(sol_array, ev, group_meeting_days, iteraciones=1000, T_init=1.0, cooling_rate=0.99, rng=random,
+             tiempo_s=None, enfriamiento="geometrico", recalentar=False):
+    """
+    Recocido simulado en sitio sobre sol_array (ev debe describirla).
+    Cada iteración propone un MovimientoSA, lo evalúa con el delta del evaluador y
+    solo lo aplica si se acepta: siempre si mejora lexicográficamente y, si no, con
+    probabilidad exp(-Δ/T), con Δ el delta ponderado con PESOS_LEXICOGRAFICOS.
+
+    T_init: None -> se calibra con calibrar_temperatura.
+    tiempo_s: presupuesto de reloj; se corta al agotarlo (o al llegar a iteraciones,
+    que puede ser None). El avance del enfriamiento se mide en tiempo, no en iteraciones.
+    enfriamiento:
+        - "geometrico": T *= cooling_rate por iteración; con tiempo_s,
+          T = T0 · T_FINAL_RELATIVA^avance.
+        - "adaptativo": cada BLOQUE iteraciones enfría geométricamente con el factor que
+          lleva la T actual a T0 · T_FINAL_RELATIVA justo al agotar el presupuesto; si la
+          tasa de aceptación de empeoramientos supera la objetivo (que baja de
+          ACEPTACION_INICIAL a ACEPTACION_FINAL) ese bloque enfría el doble.
+    recalentar (solo adaptativo): tras PACIENCIA_BLOQUES bloques sin nuevo mejor, vuelve
+    a la mejor solución y recalienta a RECALENTAR veces la temperatura con la que se
+    encontró (si ya la hubo); como el factor se recalcula con el presupuesto restante,
+    vuelve a enfriar a tiempo.
+
+    Devuelve (mejor SolucionArray, mejor puntaje, trace); trace guarda el mejor
+    puntaje cada vez que mejora.
+    """
+    if iteraciones is None and tiempo_s is None:
+        raise ValueError("hace falta iteraciones o tiempo_s")
+    if enfriamiento not in ("geometrico", "adaptativo"):
+        raise ValueError(f"Enfriamiento desconocido: {enfriamiento}")
+
+    proponedor = ProponedorSA(sol_array, group_meeting_days, rng)
+    if T_init is None:
+        T_init = calibrar_temperatura(proponedor, ev)
+    w0, w1, w2 = PESOS_LEXICOGRAFICOS   # locales: el bucle interno no llama a peso_lexicografico
+    score = ev.puntaje()
+    best_score = score
+    best_ocupante = sol_array.ocupante.copy()
+    trace = [score]
     T = T_init
+    por_iteracion = enfriamiento == "geometrico" and tiempo_s is None
+
+    inicio = time.perf_counter()
+    fin = inicio + tiempo_s if tiempo_s is not None else None
+    peores = peores_aceptados = bloques_sin_mejora = 0
+    mejor_en_bloque = False
+    T_mejor = None   # T con la que se encontró el último mejor (None: aún no mejoró)
+    T_final = T_init * T_FINAL_RELATIVA
+    avance_previo = 0.0
+
+    it = 0
+    while iteraciones is None or it < iteraciones:
+        if it and it % BLOQUE == 0:
+            if fin is not None:
+                ahora = time.perf_counter()
+                if ahora >= fin:
+                    break
+                avance = (ahora - inicio) / tiempo_s
+            else:
+                avance = it / iteraciones
+            if enfriamiento == "adaptativo":
+                objetivo = ACEPTACION_INICIAL * (ACEPTACION_FINAL / ACEPTACION_INICIAL) ** avance
+                tasa = peores_aceptados / peores if peores else objetivo
+                if T > T_final:
+                    factor = (T_final / T) ** (min(avance - avance_previo, 1.0) / max(1.0 - avance_previo, 1e-9))
+                    T *= factor ** ACELERAR if tasa > objetivo else factor
+                avance_previo = avance
+                bloques_sin_mejora = 0 if mejor_en_bloque else bloques_sin_mejora + 1
+                if recalentar and bloques_sin_mejora >= PACIENCIA_BLOQUES and T_mejor is not None:
+                    T = max(T, RECALENTAR * T_mejor)
+                    score = _volver_a(sol_array, ev, best_ocupante)
+                    bloques_sin_mejora = 0
+                peores = peores_aceptados = 0
+                mejor_en_bloque = False
+            elif not por_iteracion:
+                T = T_init * T_FINAL_RELATIVA ** avance
+        it += 1
+
+        mov = proponedor.proponer()
+        if mov is not None:
+            delta = mov.delta(ev)
+            peso = delta[0] * w0 + delta[1] * w1 + delta[2] * w2
+            if delta < (0, 0, 0) or peso <= 0:
+                acepta = True
+            else:
+                peores += 1
+                acepta = T > 0 and rng.random() < math.exp(-peso / T)
+                peores_aceptados += acepta
+            if acepta:
+                mov.aplicar(sol_array, ev)
+                sol_array.confirmar()
+                score = ev.puntaje()
+                if score < best_score:
+                    best_score = score
+                    best_ocupante = sol_array.ocupante.copy()
+                    trace.append(best_score)
+                    mejor_en_bloque = True
+                    T_mejor = T
+        if por_iteracion:
+            T *= cooling_rate
+
+    contadores["movimientos"] += it
+    return SolucionArray(sol_array.ci, best_ocupante), best_score, trace
+
+
+def simulated_annealing_assignments(initial_solution, group_meeting_days, path_json, iterations=1000, T_init=1.0,
+                                    cooling_rate=0.99, seed=None, tiempo_s=None, enfriamiento="geometrico",
+                                    recalentar=False):
+    """
+    Envoltorio compatible: misma firma y mismo retorno (best_solution, best_score, trace)
+    que la versión con copias, sobre el motor en sitio (recocido).
+    seed: si se da, usa un random.Random propio; si no, el generador global.
+    T_init=None calibra la temperatura inicial; tiempo_s, enfriamiento y recalentar se
+    pasan a recocido (p. ej. tiempo_s=2, iterations=None, T_init=None da la mejor
+    solución encontrada en 2 segundos).
+    """
+    # path_json: ruta del JSON o CompiledInstance ya cargada
+    instance = como_instancia(path_json)
+    sol_array = SolucionArray.desde_dict(instance, initial_solution)
+    ev = EvaluadorIncremental.desde_array(sol_array)
+    rng = random.Random(seed) if seed is not None else random
 
-    for _ in range(iterations):
-        # 1. Mutar la solución actual
-        mutated_solution = mutate_solution(current_solution, days_e, employees_g, group_meeting_days)
-        mutated_score = evaluate_solution(mutated_solution, path_json)
-
-        # 2. Diferencia (usamos comparaciones lexicográficas)
-        delta = lexicographic_delta(mutated_score, current_score)
-
-        # 3. Aceptación
-        if mutated_score < current_score:  # mejora lexicográfica
-            current_solution = mutated_solution
-            current_score = mutated_score
-            if current_score < best_score:
-                best_solution = copy.deepcopy(current_solution)
-                best_score = current_score
-            trace.append(current_score)
-        elif random.random() < math.exp(-delta / T):
-            current_solution = mutated_solution
-            current_score = mutated_score
-            trace.append(current_score)
-
-        # 4. Enfriar temperatura
-        T *= cooling_rate
-
-    return best_solution, best_score, trace
+    best, best_score, trace = recocido(sol_array, ev, group_meeting_days, iterations, T_init, cooling_rate, rng,
+                                       tiempo_s, enfriamiento, recalentar)
+    return best.a_dict(), best_score, trace
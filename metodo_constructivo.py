@@ -3,10 +3,14 @@
 # =========================
 # Imports
 # =========================
-import json
+import heapq
+import time
 from typing import Dict, List, Tuple
 from collections import defaultdict, Counter
 from score import evaluate_solution
+from instancia import como_instancia
+from indices import IndiceOcupacion
+from grafos import RedFlujo
 
 
 # =========================
@@ -52,30 +56,122 @@ def assign_group_meeting_days(days: List[str],
     """
     gdp = count_group_day_prefs(days_e, employees_g, days)
     groups_sorted = order_groups_by_peak(gdp)
-    day_groups: Dict[str, List[str]] = {d: [] for d in days}
     groups_days: Dict[str, str] = {}
     cap_total = total_desks(desks_z)
-
-    def total_on_day(d: str) -> int:
-        return sum(group_size(employees_g, g) for g in day_groups[d])
+    carga = {d: 0 for d in days}   # personas con reunión cada día (acumulado)
 
     for g in groups_sorted:
         pref_days = sorted(days, key=lambda d: gdp[g][d], reverse=True)
+        size = group_size(employees_g, g)
         placed = False
         for d in pref_days:
-            if total_on_day(d) + group_size(employees_g, g) <= cap_total:
-                day_groups[d].append(g)
+            if carga[d] + size <= cap_total:
+                carga[d] += size
                 groups_days[g] = d
                 placed = True
                 break
         if not placed:
             # fallback: día con mayor capacidad remanente
-            d_best = max(days, key=lambda d: cap_total - total_on_day(d))
-            day_groups[d_best].append(g)
+            d_best = max(days, key=lambda d: cap_total - carga[d])
+            carga[d_best] += size
             groups_days[g] = d_best
 
     return groups_days
 
+def segundo_dia_factible(carga: Dict[str, int], cap_total: int, n_empleados: int) -> bool:
+    """
+    ¿Alcanza la capacidad residual para que todos tengan un segundo día distinto al de
+    su grupo? (condición de Hall del problema de transporte: el total cabe y los que se
+    reúnen el día d caben en los demás días).
+    """
+    residual = {d: cap_total - c for d, c in carga.items()}
+    if min(residual.values(), default=0) < 0:
+        return False
+    total = sum(residual.values())
+    return n_empleados <= total and all(carga[d] <= total - residual[d] for d in carga)
+
+def assign_group_meeting_days_exact(days: List[str],
+                                    employees_g: Dict[str, List[str]],
+                                    days_e: Dict[str, List[str]],
+                                    desks_z: Dict[str, List[str]],
+                                    limite_s: float = 1.0) -> Dict[str, str]:
+    """
+    Día de reunión por grupo que maximiza la suma de gustos grupo-día (branch and bound).
+    - poda por capacidad: lo que se reúne un día no supera los escritorios
+    - cota: valor actual + el mejor día posible de cada grupo pendiente
+    - en las hojas se exige que el segundo día siga siendo factible
+    Parte de la solución greedy como incumbente; si se agota limite_s devuelve la mejor
+    encontrada (nunca peor que la greedy) y si no hay ninguna factible, la greedy.
+    """
+    greedy = assign_group_meeting_days(days, employees_g, days_e, desks_z)
+    gdp = count_group_day_prefs(days_e, employees_g, days)
+    cap_total = total_desks(desks_z)
+    n_empleados = sum(len(es) for es in employees_g.values())
+
+    # grupos grandes primero (podan antes por capacidad); días por gusto desc
+    orden = sorted(employees_g, key=lambda g: (-group_size(employees_g, g), -max(gdp[g].values(), default=0)))
+    n = len(orden)
+    size = [group_size(employees_g, g) for g in orden]
+    opciones = [sorted(days, key=lambda d: gdp[g][d], reverse=True) for g in orden]
+    resto = [0] * (n + 1)
+    for i in range(n - 1, -1, -1):
+        resto[i] = resto[i + 1] + max(gdp[orden[i]].values(), default=0)
+
+    carga = {d: 0 for d in days}
+    for g, d in greedy.items():
+        carga[d] += group_size(employees_g, g)
+    if max(carga.values(), default=0) <= cap_total and segundo_dia_factible(carga, cap_total, n_empleados):
+        best, best_val = dict(greedy), sum(gdp[g][d] for g, d in greedy.items())
+    else:
+        best, best_val = None, -1
+    if best_val == resto[0]:
+        return best   # la greedy ya alcanza la cota
+
+    carga = {d: 0 for d in days}
+    elegido: List[str] = [None] * n
+    k = [0] * (n + 1)
+    valor = 0
+    nodos = 0
+    fin = time.perf_counter() + limite_s
+    i = 0
+    while i >= 0:
+        nodos += 1
+        if nodos & 1023 == 0 and time.perf_counter() > fin:
+            break
+        if i == n:
+            if valor > best_val and segundo_dia_factible(carga, cap_total, n_empleados):
+                best_val = valor
+                best = {orden[j]: elegido[j] for j in range(n)}
+                if best_val == resto[0]:
+                    break
+            i -= 1
+            continue
+        g = orden[i]
+        if elegido[i] is not None:
+            d = elegido[i]
+            carga[d] -= size[i]
+            valor -= gdp[g][d]
+            elegido[i] = None
+        bajo = False
+        while k[i] < len(opciones[i]):
+            d = opciones[i][k[i]]
+            k[i] += 1
+            if valor + gdp[g][d] + resto[i + 1] <= best_val:
+                k[i] = len(opciones[i])   # los días siguientes tienen menos gusto
+                break
+            if carga[d] + size[i] <= cap_total:
+                carga[d] += size[i]
+                valor += gdp[g][d]
+                elegido[i] = d
+                i += 1
+                k[i] = 0
+                bajo = True
+                break
+        if not bajo:
+            i -= 1
+
+    return best if best is not None else greedy
+
 def residual_capacity_by_day(days: List[str],
                              groups_days: Dict[str, str],
                              employees_g: Dict[str, List[str]],
@@ -128,6 +224,65 @@ def assign_second_day_constructive(prefs: Dict[str, List[str]],
     }
     return second_day, stats
 
+def assign_second_day_flow(prefs: Dict[str, List[str]],
+                           groups_days: Dict[str, str],
+                           employee_group,  # dict o callable emp->grupo
+                           residual_capacity: Dict[str, int],
+                           days_order: Tuple[str, ...],
+                           allow_same_as_group: bool = False):
+    """
+    Misma firma y salida que assign_second_day_constructive, pero exacta: problema de
+    transporte empleado->día con capacidad residual por día. Primero se asigna la mayor
+    cantidad posible de empleados y, entre esas, se maximizan los gustos satisfechos.
+    Los empleados se agrupan por tipo (día de grupo, días que le gustan): hay a lo sumo
+    |días|·2^|días| tipos, así que el flujo no crece con el número de empleados.
+    """
+    cap = {d: max(0, int(residual_capacity.get(d, 0))) for d in days_order}
+
+    def grp(e: str) -> str:
+        return employee_group[e] if isinstance(employee_group, dict) else employee_group(e)
+
+    tipos: Dict[Tuple[str, frozenset], List[str]] = {}
+    for e in prefs:  # orden de inserción del dict (solo para repartir dentro de cada tipo)
+        gday = groups_days[grp(e)]
+        liked = frozenset(d for d in (prefs.get(e, []) or []) if d in cap)
+        tipos.setdefault((gday, liked), []).append(e)
+
+    # nodos: 0 fuente, 1 sumidero, luego tipos y días
+    lista_tipos = list(tipos.items())
+    base_dia = 2 + len(lista_tipos)
+    red = RedFlujo(base_dia + len(days_order))
+    for i, d in enumerate(days_order):
+        red.arco(base_dia + i, 1, cap[d], 0)
+    refs = []
+    for k, ((gday, liked), emps) in enumerate(lista_tipos):
+        red.arco(0, 2 + k, len(emps), 0)
+        arcos = []
+        for i, d in enumerate(days_order):
+            if allow_same_as_group or d != gday:
+                arcos.append((d, red.arco(2 + k, base_dia + i, len(emps), 0 if d in liked else 1)))
+        refs.append(arcos)
+    red.flujo(0, 1)
+
+    second_day: Dict[str, str] = {}
+    satisfechos = 0
+    for ((gday, liked), emps), arcos in zip(lista_tipos, refs):
+        # gustos primero, en el orden de days_order
+        arcos = sorted(arcos, key=lambda a: a[0] not in liked)
+        pendientes = iter(emps)
+        for d, ref in arcos:
+            for _ in range(red.flujo_en(ref)):
+                second_day[next(pendientes)] = d
+                cap[d] -= 1
+                satisfechos += d in liked
+
+    stats = {
+        "satisfechos_segundo_dia": satisfechos,
+        "ocupacion_segundo": dict(Counter(second_day.values())),
+        "capacidad_restante": cap,
+    }
+    return second_day, stats
+
 def build_schedule_by_day(prefs: Dict[str, List[str]],
                           groups_days: Dict[str, str],
                           employee_group,
@@ -155,19 +310,19 @@ def build_schedule_by_day(prefs: Dict[str, List[str]],
 # =========================
 # asignar_puestos.py
 # =========================
+DIA = 0   # seat_day_* sienta un solo día: clave única del IndiceOcupacion
+
 def build_zone_of(desks_z: Dict[str, List[str]]) -> Dict[str, str]:
     return {desk: z for z, ds in desks_z.items() for desk in ds}
 
-def seat_day_constructive(employees_day: List[str],
-                          desks_e: Dict[str, List[str]],
-                          desks_z: Dict[str, List[str]],
-                          employee_group,                 # dict o callable emp->grupo
-                          zones_order: Tuple[str, ...],   # p.ej. ('Z0','Z1')
-                          zone_of: Dict[str, str]) -> Dict[str, str]:
+def repartir_zonas(employees_day: List[str],
+                   desks_z: Dict[str, List[str]],
+                   employee_group,                 # dict o callable emp->grupo
+                   zones_order: Tuple[str, ...]) -> Dict[str, str]:
     """
-    Sienta a todos si hay sillas suficientes globalmente.
-    Prioriza: gusto en su zona -> gusto en otra zona -> cualquier en su zona -> cualquier en otra.
-    Sin errores por “aislados”; tú lo puntúas después.
+    Fases A y B de seat_day_constructive: zona objetivo de cada empleado del día.
+    Funciona con cualquier número de zonas: la zona con más cupo sale de un heap
+    (empates -> orden de zones_order), así que cuesta O(E log Z).
     """
     # Fase A: reparto deseado por grupo (evitando singletons cuando se pueda), sin abortar
     groups_today = defaultdict(list)
@@ -176,83 +331,113 @@ def seat_day_constructive(employees_day: List[str],
         groups_today[g].append(e)
 
     cap_rem = {z: len(desks_z[z]) for z in zones_order}
-    per_group_zone_count = {g: {z: 0 for z in zones_order} for g in groups_today}
+    per_group_zone_count = {g: defaultdict(int) for g in groups_today}   # solo zonas usadas
+    zone_pos = {z: i for i, z in enumerate(zones_order)}
 
-    def best_zone():
-        return max(zones_order, key=lambda z: (cap_rem[z], -int(z != zones_order[0])))
+    # heap de zonas por cupo restante (desc); el índice en zones_order desempata
+    heap = [(-cap_rem[z], i, z) for i, z in enumerate(zones_order)]
+    heapq.heapify(heap)
 
     for g in sorted(groups_today.keys()):
         k = len(groups_today[g])
         blocks = [1] if k == 1 else ([3] + [2]*((k-3)//2) if k % 2 else [2]*(k//2))
         for b in blocks:
-            z = best_zone()
-            zz = zones_order[1] if z == zones_order[0] else zones_order[0]
+            _, i, z = heapq.heappop(heap)
             if cap_rem[z] >= b:
                 per_group_zone_count[g][z] += b; cap_rem[z] -= b
-            elif cap_rem[zz] >= b:
-                per_group_zone_count[g][zz] += b; cap_rem[zz] -= b
-            else:
-                # degradación suave (partir bloques sin abortar)
-                need = b
-                for ztry in (z, zz):
-                    take = min(cap_rem[ztry], need)
-                    if take:
-                        per_group_zone_count[g][ztry] += take
-                        cap_rem[ztry] -= take
-                        need -= take
+                heapq.heappush(heap, (-cap_rem[z], i, z))
+                continue
+            # ninguna zona tiene cupo para el bloque: degradación suave, se parte
+            # entre las zonas de mayor cupo sin abortar
+            need = b
+            sacadas = [(i, z)]
+            take = min(cap_rem[z], need)
+            while True:
+                if take:
+                    per_group_zone_count[g][z] += take
+                    cap_rem[z] -= take
+                    need -= take
+                if need == 0 or not heap or -heap[0][0] == 0:
+                    break
+                _, i, z = heapq.heappop(heap)
+                sacadas.append((i, z))
+                take = min(cap_rem[z], need)
+            for i, z in sacadas:
+                heapq.heappush(heap, (-cap_rem[z], i, z))
 
     # Fase B: elegir quién va a cada zona
     emp_zone_target = {}
     for g in sorted(groups_today.keys()):
         Es = groups_today[g]
         idx = 0
-        for z in zones_order:
+        for z in sorted(per_group_zone_count[g], key=zone_pos.__getitem__):
             cnt = per_group_zone_count[g][z]
             for _ in range(cnt):
                 if idx < len(Es):
                     emp_zone_target[Es[idx]] = z
                     idx += 1
         while idx < len(Es):
-            zf = best_zone()
+            _, i, zf = heapq.heappop(heap)
             emp_zone_target[Es[idx]] = zf
             cap_rem[zf] = max(0, cap_rem[zf]-1)
+            heapq.heappush(heap, (-cap_rem[zf], i, zf))
             idx += 1
 
+    return emp_zone_target
+
+def seat_day_constructive(employees_day: List[str],
+                          desks_e: Dict[str, List[str]],
+                          desks_z: Dict[str, List[str]],
+                          employee_group,                 # dict o callable emp->grupo
+                          zones_order: Tuple[str, ...],   # p.ej. ('Z0','Z1',...,'Zn')
+                          zone_of: Dict[str, str]) -> Dict[str, str]:
+    """
+    Sienta a todos si hay sillas suficientes globalmente.
+    Prioriza: gusto en su zona -> gusto en otra zona -> cualquier en su zona -> cualquier en otra.
+    Sin errores por “aislados”; tú lo puntúas después.
+    """
+    emp_zone_target = repartir_zonas(employees_day, desks_z, employee_group, zones_order)
+    zonas = set(zones_order)
+
     # Fase C: asignar escritorios (gustos priorizados)
-    desk_taken = set()
+    libres = IndiceOcupacion(desks_z, [DIA])
     assignment: Dict[str, str] = {}
+    zone_ptr = 0   # en un día solo se ocupa: las zonas llenas no vuelven a tener cupo
+
+    # empleados por zona objetivo en una sola pasada (conserva el orden del día)
+    por_zona = defaultdict(list)
+    for e in employees_day:
+        z = emp_zone_target.get(e)
+        if z in zonas:
+            por_zona[z].append(e)
 
     for z in zones_order:
-        Ez = [e for e in employees_day if emp_zone_target.get(e) == z]
-        for e in Ez:
+        for e in por_zona.get(z, ()):
             liked = desks_e.get(e, [])
             chosen = None
             # 1) gusto en su zona
             for d in liked:
-                if d not in desk_taken and zone_of.get(d) == z:
+                if zone_of.get(d) == z and libres.esta_libre(DIA, d):
                     chosen = d; break
             # 2) gusto en otra zona
             if chosen is None:
                 for d in liked:
-                    if d not in desk_taken and zone_of.get(d) in zones_order and zone_of.get(d) != z:
+                    if zone_of.get(d) in zonas and zone_of.get(d) != z and libres.esta_libre(DIA, d):
                         chosen = d; break
             # 3) cualquiera en su zona
             if chosen is None:
-                for d in desks_z[z]:
-                    if d not in desk_taken:
-                        chosen = d; break
+                chosen = libres.primero_libre(DIA, z)
             # 4) cualquiera en otra zona
             if chosen is None:
-                for zz in zones_order:
-                    for d in desks_z[zz]:
-                        if d not in desk_taken:
-                            chosen = d; break
-                    if chosen: break
+                while zone_ptr < len(zones_order) and not libres.n_libres(DIA, zones_order[zone_ptr]):
+                    zone_ptr += 1
+                if zone_ptr < len(zones_order):
+                    chosen = libres.primero_libre(DIA, zones_order[zone_ptr])
             if chosen is None:
                 # sin sillas globales; dejamos sin asignar (tú lo manejas fuera si quieres)
                 continue
             assignment[e] = chosen
-            desk_taken.add(chosen)
+            libres.ocupar(DIA, chosen)
 
     return assignment
 
@@ -260,74 +445,125 @@ def seat_day_constructive(employees_day: List[str],
 # =========================
 # crear_solucion.py
 # =========================
+def _sentar_dia(empleados: List[str],
+                desks_e: Dict[str, List[str]],
+                desks_z: Dict[str, List[str]],
+                employee_group,
+                zones_order: Tuple[str, ...],
+                zone_of: Dict[str, str],
+                seat_fn) -> Dict[str, str]:
+    """Asientos de un día (seat_fn + fallback). Solo depende de los empleados del día."""
+    assignment = seat_fn(
+        employees_day=empleados,
+        desks_e=desks_e,
+        desks_z=desks_z,
+        employee_group=employee_group,
+        zones_order=zones_order,
+        zone_of=zone_of
+    )
+
+    # Fallback: si faltó alguien, dale cualquier desk
+    usados = set(assignment.values())
+    for e in empleados:
+        if e not in assignment:
+            # gusto libre en cualquier zona
+            pick = next((dd for dd in (desks_e.get(e, []) or []) if dd in zone_of and dd not in usados), None)
+            if pick is None:
+                # cualquier libre
+                for z, ds in desks_z.items():
+                    pick = next((dd for dd in ds if dd not in usados), None)
+                    if pick: break
+            if pick is None:
+                # sin sillas globales; continúa (quedará sin asignar)
+                continue
+            assignment[e] = pick
+            usados.add(pick)
+    return assignment
+
+# contexto compartido de cada proceso del pool (se envía una sola vez por proceso)
+_CONTEXTO_DIA: Dict = {}
+
+def _iniciar_proceso_dia(contexto: Dict):
+    _CONTEXTO_DIA.clear()
+    _CONTEXTO_DIA.update(contexto)
+
+def _sentar_dia_en_proceso(empleados: List[str]) -> Dict[str, str]:
+    return _sentar_dia(empleados, **_CONTEXTO_DIA)
+
 def crear_solucion(days: List[str],
                    schedule_total: Dict[str, List[str]],
                    desks_e: Dict[str, List[str]],
                    desks_z: Dict[str, List[str]],
                    employee_group,
-                   zones_order: Tuple[str, ...]) -> Dict[str, Dict[str, List[Tuple[str, str]]]]:
+                   zones_order: Tuple[str, ...],
+                   zone_of: Dict[str, str] = None,
+                   seat_fn=None,
+                   workers: int = None) -> Dict[str, Dict[str, List[Tuple[str, str]]]]:
     """
     Devuelve:
     { 'L': {'Z0': [(desk,emp),...], 'Z1': [...]}, 'MA': {...}, 'MI': {...}, 'J': {...}, 'V': {...} }
+    seat_fn: cómo sentar un día (por defecto seat_day_constructive; p.ej. asientos.seat_day_matching).
+    workers: con workers > 1 los días se sientan en paralelo en un pool de procesos
+    (seat_fn y employee_group deben poder serializarse: funciones de módulo y dicts).
+    El resultado es el mismo que en secuencial.
     """
-    zone_of = build_zone_of(desks_z)
+    if seat_fn is None:
+        seat_fn = seat_day_constructive
+    if zone_of is None:
+        zone_of = build_zone_of(desks_z)
     solucion = {d: {z: [] for z in desks_z.keys()} for d in days}
-
-    for d in days:
-        empleados = list(schedule_total[d])  # conserva orden
-        assignment = seat_day_constructive(
-            employees_day=empleados,
-            desks_e=desks_e,
-            desks_z=desks_z,
-            employee_group=employee_group,
-            zones_order=zones_order,
-            zone_of=zone_of
-        )
-
-        # Fallback: si faltó alguien, dale cualquier desk
-        usados = set(assignment.values())
-        for e in empleados:
-            if e not in assignment:
-                # gusto libre en cualquier zona
-                pick = next((dd for dd in (desks_e.get(e, []) or []) if dd in zone_of and dd not in usados), None)
-                if pick is None:
-                    # cualquier libre
-                    for z, ds in desks_z.items():
-                        pick = next((dd for dd in ds if dd not in usados), None)
-                        if pick: break
-                if pick is None:
-                    # sin sillas globales; continúa (quedará sin asignar)
-                    continue
-                assignment[e] = pick
-                usados.add(pick)
-
-        dkey = d
+    contexto = dict(desks_e=desks_e, desks_z=desks_z, employee_group=employee_group,
+                    zones_order=zones_order, zone_of=zone_of, seat_fn=seat_fn)
+    empleados_por_dia = [list(schedule_total[d]) for d in days]  # conserva orden
+
+    if workers and workers > 1 and len(days) > 1:
+        from concurrent.futures import ProcessPoolExecutor
+        with ProcessPoolExecutor(max_workers=min(workers, len(days)),
+                                 initializer=_iniciar_proceso_dia, initargs=(contexto,)) as pool:
+            asignaciones = list(pool.map(_sentar_dia_en_proceso, empleados_por_dia))
+    else:
+        asignaciones = [_sentar_dia(empleados, **contexto) for empleados in empleados_por_dia]
+
+    # unión en el orden de los días
+    for d, empleados, assignment in zip(days, empleados_por_dia, asignaciones):
         for e in empleados:
             if e in assignment:
                 desk = assignment[e]
                 z = zone_of[desk]
-                solucion[dkey][z].append((desk, e))
+                solucion[d][z].append((desk, e))
 
     return solucion
 
 
-def generar_solucion(instance: Dict) -> Dict[str, Dict[str, List[Tuple[str, str]]]]:
+def generar_solucion(instance, seat_fn=None, second_day_fn=None, meeting_days_fn=None, workers=None) -> Dict[str, Dict[str, List[Tuple[str, str]]]]:
     """
     Orquesta todo y devuelve 'solucion' lista para usar.
+    Acepta el dict del JSON o una CompiledInstance.
+    seat_fn: motor de asientos por día (None -> seat_day_constructive).
+    second_day_fn: segundo día por empleado (None -> assign_second_day_constructive;
+    assign_second_day_flow para la versión exacta).
+    meeting_days_fn: día de reunión por grupo (None -> assign_group_meeting_days;
+    assign_group_meeting_days_exact para branch and bound).
+    workers: procesos para sentar los días en paralelo (ver crear_solucion).
     """
-    Days        = instance["Days"]
-    Zones       = tuple(instance["Zones"])
-    Desks_Z     = instance["Desks_Z"]
-    Days_E      = instance["Days_E"]
-    Desks_E     = instance["Desks_E"]
-    Employees_G = instance["Employees_G"]
-
-    EMP_TO_G = build_employee_to_group(Employees_G)
-
-    groups_days = assign_group_meeting_days(Days, Employees_G, Days_E, Desks_Z)
+    if meeting_days_fn is None:
+        meeting_days_fn = assign_group_meeting_days
+    if second_day_fn is None:
+        second_day_fn = assign_second_day_constructive
+    ci = como_instancia(instance)
+    Days        = ci.days
+    Zones       = tuple(ci.zones)
+    Desks_Z     = ci.desks_z
+    Days_E      = ci.days_e
+    Desks_E     = ci.desks_e
+    Employees_G = ci.employees_g
+
+    EMP_TO_G = ci.emp_to_group
+
+    groups_days = meeting_days_fn(Days, Employees_G, Days_E, Desks_Z)
     days_desks  = residual_capacity_by_day(Days, groups_days, Employees_G, Desks_Z)
 
-    second_day, _ = assign_second_day_constructive(
+    second_day, _ = second_day_fn(
         prefs=Days_E,
         groups_days=groups_days,
         employee_group=EMP_TO_G,
@@ -350,11 +586,13 @@ def generar_solucion(instance: Dict) -> Dict[str, Dict[str, List[Tuple[str, str]
         desks_e=Desks_E,
         desks_z=Desks_Z,
         employee_group=EMP_TO_G,
-        zones_order=Zones
+        zones_order=Zones,
+        zone_of=ci.zone_of,
+        seat_fn=seat_fn,
+        workers=workers
     )
     return solucion, groups_days
 
-def generar_solucion_desde_archivo(path_json: str):
-    with open(path_json, "r", encoding="utf-8") as f:
-        inst = json.load(f)
-    return generar_solucion(inst)
\ No newline at end of file
+def generar_solucion_desde_archivo(path_json):
+    """Igual que generar_solucion; acepta también la ruta o una CompiledInstance ya cargada."""
+    return generar_solucion(como_instancia(path_json))
\ No newline at end of file
@@ -1,29 +1,76 @@
+import heapq
 import random
+import weakref
 from typing import Dict, List, Tuple
 import json
 import json, argparse, secrets
-from score import evaluate_solution
+import numpy as np
+from score import evaluate_solution, evaluate_batch
+from instancia import como_instancia
+from indices import IndiceOcupacion
+from solucion_array import apilar_soluciones
 
 # ---------------------------
 # 1) Día de reunión por grupo
 # ---------------------------
+def _contar_gustos_grupo_dia(days, employees_g, days_e) -> Dict[str, Dict[str, int]]:
+    gdp = {g: {d: 0 for d in days} for g in employees_g}
+    for g, emps in employees_g.items():
+        for e in emps:
+            for d in days_e.get(e, []):
+                if d in gdp[g]:
+                    gdp[g][d] += 1
+    return gdp
+
+# lo que no cambia entre corridas se calcula una vez por CompiledInstance
+_PRECALCULO: "weakref.WeakKeyDictionary" = weakref.WeakKeyDictionary()
+
+def _gustos_por_zona(liked: List[str], zone_of: Dict[str, str]) -> Dict[str, List[str]]:
+    out: Dict[str, List[str]] = {}
+    for d in liked:
+        if d in zone_of:
+            out.setdefault(zone_of[d], []).append(d)
+    return out
+
+def _gustos_indices(ci) -> List[List[int]]:
+    gustos = [[] for _ in range(ci.n_employees)]
+    for e, ds in ci.desks_e.items():
+        i = ci.emp_idx.get(e)
+        if i is not None:
+            gustos[i] = sorted({ci.desk_idx[d] for d in ds or [] if d in ci.desk_idx})
+    return gustos
+
+def _precalculo(ci) -> Dict:
+    pre = _PRECALCULO.get(ci)
+    if pre is None:
+        pre = {
+            "gdp": _contar_gustos_grupo_dia(ci.days, ci.employees_g, ci.days_e),
+            "total": sum(len(ds) for ds in ci.desks_z.values()),
+            "gustos_por_zona": {
+                e: _gustos_por_zona(ci.desks_e.get(e, []) or [], ci.zone_of) for e in ci.days_e
+            },
+            # por índice de empleado: índices de sus escritorios preferidos, ordenados (para
+            # SolucionArray); se arma desde Desks_E, sin recorrer la matriz densa
+            "gustos_idx": _gustos_indices(ci),
+        }
+        pre["gustos_set"] = [frozenset(ls) for ls in pre["gustos_idx"]]
+        _PRECALCULO[ci] = pre
+    return pre
+
 def rand_assign_group_meeting_days(
     days: List[str],
     employees_g: Dict[str, List[str]],
     days_e: Dict[str, List[str]],
     desks_z: Dict[str, List[str]],
     seed: int = 0,
+    gdp: Dict[str, Dict[str, int]] = None,   # gustos grupo-día ya calculados (opcional)
 ) -> Dict[str, str]:
     rng = random.Random(seed)
     cap_total = sum(len(ds) for ds in desks_z.values())
 
     # gustos grupo-día
-    gdp = {g: {d: 0 for d in days} for g in employees_g}
-    for g, emps in employees_g.items():
-        for e in emps:
-            for d in days_e.get(e, []):
-                if d in gdp[g]:
-                    gdp[g][d] += 1
+    if gdp is None:
+        gdp = _contar_gustos_grupo_dia(days, employees_g, days_e)
 
     # ordenar grupos por pico; empates aleatorios
     peak = {g: max(gdp[g].values()) for g in employees_g}
@@ -37,11 +84,8 @@ def rand_assign_group_meeting_days(
         rng.shuffle(groups[i:j])
         i = j
 
-    day_groups: Dict[str, List[str]] = {d: [] for d in days}
     groups_days: Dict[str, str] = {}
-
-    def total_on_day(d: str) -> int:
-        return sum(len(employees_g[g]) for g in day_groups[d])
+    carga = {d: 0 for d in days}   # personas con reunión cada día (acumulado)
 
     for g in groups:
         # ordenar días por gusto; empates aleatorios
@@ -56,8 +100,8 @@ def rand_assign_group_meeting_days(
 
         placed = False
         for d in pref_days:
-            if total_on_day(d) + len(employees_g[g]) <= cap_total:
-                day_groups[d].append(g)
+            if carga[d] + len(employees_g[g]) <= cap_total:
+                carga[d] += len(employees_g[g])
                 groups_days[g] = d
                 placed = True
                 break
@@ -66,13 +110,13 @@ def rand_assign_group_meeting_days(
             best_cap = -1
             best_days = []
             for d in days:
-                rem = cap_total - total_on_day(d)
+                rem = cap_total - carga[d]
                 if rem > best_cap:
                     best_cap = rem; best_days = [d]
                 elif rem == best_cap:
                     best_days.append(d)
             d_pick = rng.choice(best_days)
-            day_groups[d_pick].append(g)
+            carga[d_pick] += len(employees_g[g])
             groups_days[g] = d_pick
 
     return groups_days
@@ -127,9 +171,12 @@ def rand_seat_day_constructive(
     employee_group,                 # dict o callable
     zones_order: Tuple[str, ...],   # ('Z0','Z1')
     seed: int = 0,
+    zone_of: Dict[str, str] = None,
+    gustos_por_zona: Dict[str, Dict[str, List[str]]] = None,   # emp -> zona -> gustos (precalculado)
 ) -> Dict[str, str]:
     rng = random.Random(seed)
-    zone_of = {desk: z for z, ds in desks_z.items() for desk in ds}
+    if zone_of is None:
+        zone_of = {desk: z for z, ds in desks_z.items() for desk in ds}
 
     # grupos presentes
     from collections import defaultdict
@@ -190,45 +237,97 @@ def rand_seat_day_constructive(
             idx += 1
 
     # asignar escritorios
-    desk_taken = set()
+    DIA = 0
+    libres = IndiceOcupacion(desks_z, [DIA])
     assignment: Dict[str, str] = {}
 
+    por_zona = {z: [] for z in zones_order}
+    for e in employees_day:
+        if emp_zone_target.get(e) in por_zona:
+            por_zona[emp_zone_target[e]].append(e)
+
     for z in zones_order:
-        Ez = [e for e in employees_day if emp_zone_target.get(e) == z]
+        Ez = por_zona[z]
         rng.shuffle(Ez)
         for e in Ez:
             liked = desks_e.get(e, []) or []
             # 1) gusto en su zona
-            liked_in_zone = [d for d in liked if d not in desk_taken and zone_of.get(d) == z]
+            if gustos_por_zona is not None:
+                liked_in_zone = [d for d in gustos_por_zona[e].get(z, ()) if libres.esta_libre(DIA, d)]
+            else:
+                liked_in_zone = [d for d in liked if zone_of.get(d) == z and libres.esta_libre(DIA, d)]
             rng.shuffle(liked_in_zone)
             chosen = liked_in_zone[0] if liked_in_zone else None
             # 2) gusto en otra zona
             if chosen is None:
-                liked_any = [d for d in liked if d not in desk_taken and zone_of.get(d) in zones_order]
+                liked_any = [d for d in liked if zone_of.get(d) in zones_order and libres.esta_libre(DIA, d)]
                 rng.shuffle(liked_any)
                 chosen = liked_any[0] if liked_any else None
-            # 3) cualquiera en su zona
+            # 3) cualquiera en su zona (O(1) con el índice)
             if chosen is None:
-                free_here = [d for d in desks_z[z] if d not in desk_taken]
-                rng.shuffle(free_here)
-                chosen = free_here[0] if free_here else None
+                chosen = libres.elegir_libre(DIA, z, rng)
             # 4) cualquiera en otra zona
             if chosen is None:
-                all_free = [d for zz in zones_order for d in desks_z[zz] if d not in desk_taken]
-                rng.shuffle(all_free)
-                chosen = all_free[0] if all_free else None
+                chosen = libres.elegir_libre(DIA, None, rng)
 
             if chosen is None:
                 continue  # sin sillas globales
 
             assignment[e] = chosen
-            desk_taken.add(chosen)
+            libres.ocupar(DIA, chosen)
 
     return assignment
 
 # ----------------------------
 # 4) Construir la SOLUCIÓN final
 # ----------------------------
+def _sentar_dia_random(empleados: List[str],
+                       semilla: int,
+                       desks_e: Dict[str, List[str]],
+                       desks_z: Dict[str, List[str]],
+                       employee_group,
+                       zones_order: Tuple[str, ...],
+                       seat_fn,
+                       zone_of: Dict[str, str],
+                       seat_kwargs: Dict = None) -> Dict[str, str]:
+    """Asientos de un día; todo lo aleatorio sale de su semilla."""
+    assignment = seat_fn(
+        employees_day=empleados,
+        desks_e=desks_e,
+        desks_z=desks_z,
+        employee_group=employee_group,
+        zones_order=zones_order,
+        seed=semilla,
+        zone_of=zone_of,
+        **(seat_kwargs or {}),
+    )
+
+    # fallback: quien falte, gusto libre -> cualquiera libre
+    rng = random.Random(semilla + 1)
+    usados = set(assignment.values())
+    for e in empleados:
+        if e not in assignment:
+            pick = next((dd for dd in (desks_e.get(e, []) or []) if dd in zone_of and dd not in usados), None)
+            if pick is None:
+                all_free = [dd for z, ds in desks_z.items() for dd in ds if dd not in usados]
+                rng.shuffle(all_free)
+                pick = all_free[0] if all_free else None
+            if pick is None:
+                continue
+            assignment[e] = pick
+            usados.add(pick)
+    return assignment
+
+_CONTEXTO_DIA: Dict = {}
+
+def _iniciar_proceso_dia(contexto: Dict):
+    _CONTEXTO_DIA.clear()
+    _CONTEXTO_DIA.update(contexto)
+
+def _sentar_dia_random_en_proceso(args) -> Dict[str, str]:
+    empleados, semilla = args
+    return _sentar_dia_random(empleados, semilla, **_CONTEXTO_DIA)
+
 def crear_solucion_random(
     days: List[str],
     schedule_total: Dict[str, List[str]],
@@ -238,63 +337,59 @@ def crear_solucion_random(
     zones_order: Tuple[str, ...],
     seat_fn,                 # inyecta rand_seat_day_constructive
     seed: int = 0,
+    zone_of: Dict[str, str] = None,
+    workers: int = None,
+    seat_kwargs: Dict = None,   # argumentos extra para seat_fn (p.ej. datos precalculados)
 ) -> Dict[str, Dict[str, List[Tuple[str, str]]]]:
+    # las semillas de cada día se sacan antes de sentar, así el resultado no depende
+    # del orden en que se procesan los días (workers > 1 -> pool de procesos)
     rng = random.Random(seed)
-    zone_of = {desk: z for z, ds in desks_z.items() for desk in ds}
+    if zone_of is None:
+        zone_of = {desk: z for z, ds in desks_z.items() for desk in ds}
     solucion = {d: {z: [] for z in desks_z.keys()} for d in days}
-
-    for d in days:
-        empleados = list(schedule_total[d])
-        assignment = seat_fn(
-            employees_day=empleados,
-            desks_e=desks_e,
-            desks_z=desks_z,
-            employee_group=employee_group,
-            zones_order=zones_order,
-            seed=rng.randrange(10**9),
-        )
-
-        # fallback: quien falte, gusto libre -> cualquiera libre
-        usados = set(assignment.values())
-        for e in empleados:
-            if e not in assignment:
-                pick = next((dd for dd in (desks_e.get(e, []) or []) if dd in zone_of and dd not in usados), None)
-                if pick is None:
-                    all_free = [dd for z, ds in desks_z.items() for dd in ds if dd not in usados]
-                    rng.shuffle(all_free)
-                    pick = all_free[0] if all_free else None
-                if pick is None:
-                    continue
-                assignment[e] = pick
-                usados.add(pick)
-
-        dkey = d
+    contexto = dict(desks_e=desks_e, desks_z=desks_z, employee_group=employee_group,
+                    zones_order=zones_order, seat_fn=seat_fn, zone_of=zone_of, seat_kwargs=seat_kwargs)
+    tareas = [(list(schedule_total[d]), rng.randrange(10**9)) for d in days]
+
+    if workers and workers > 1 and len(days) > 1:
+        from concurrent.futures import ProcessPoolExecutor
+        with ProcessPoolExecutor(max_workers=min(workers, len(days)),
+                                 initializer=_iniciar_proceso_dia, initargs=(contexto,)) as pool:
+            asignaciones = list(pool.map(_sentar_dia_random_en_proceso, tareas))
+    else:
+        asignaciones = [_sentar_dia_random(empleados, semilla, **contexto) for empleados, semilla in tareas]
+
+    for d, (empleados, _), assignment in zip(days, tareas, asignaciones):
         for e in empleados:
             if e in assignment:
                 desk = assignment[e]
                 z = zone_of[desk]
-                solucion[dkey][z].append((desk, e))
+                solucion[d][z].append((desk, e))
 
     return solucion
 
 # -----------------------------------------
 # Wrapper: obtener SOLO la 'solucion' final
 # -----------------------------------------
-def randomized_solution(instance: Dict, seed: int = 0) -> Dict[str, Dict[str, List[Tuple[str, str]]]]:
+def randomized_solution(instance, seed: int = 0, workers: int = None) -> Dict[str, Dict[str, List[Tuple[str, str]]]]:
+    """Acepta el dict del JSON o una CompiledInstance. workers: ver crear_solucion_random."""
+    ci = como_instancia(instance)
     rng = random.Random(seed)
-    Days       = instance["Days"]           # ['L','Ma','Mi','J','V']
-    Zones      = tuple(instance["Zones"])   # ('Z0','Z1')
-    Desks_Z    = instance["Desks_Z"]
-    Days_E     = instance["Days_E"]
-    Desks_E    = instance["Desks_E"]
-    Employees_G= instance["Employees_G"]
-    EMP_TO_G   = {e: g for g, es in Employees_G.items() for e in es}
+    Days       = ci.days                # ['L','Ma','Mi','J','V']
+    Zones      = tuple(ci.zones)        # ('Z0','Z1')
+    Desks_Z    = ci.desks_z
+    Days_E     = ci.days_e
+    Desks_E    = ci.desks_e
+    Employees_G= ci.employees_g
+    EMP_TO_G   = ci.emp_to_group
+    pre        = _precalculo(ci)
 
     # 1) día de reunión por grupo (random)
-    groups_days = rand_assign_group_meeting_days(Days, Employees_G, Days_E, Desks_Z, seed=rng.randrange(10**9))
+    groups_days = rand_assign_group_meeting_days(Days, Employees_G, Days_E, Desks_Z, seed=rng.randrange(10**9),
+                                                 gdp=pre["gdp"])
 
     # 2) capacidad residual por día
-    TOTAL = sum(len(ds) for ds in Desks_Z.values())
+    TOTAL = pre["total"]
     days_desks = {d: TOTAL for d in Days}
     for g, d in groups_days.items():
         days_desks[d] -= len(Employees_G[g])
@@ -330,16 +425,19 @@ def randomized_solution(instance: Dict, seed: int = 0) -> Dict[str, Dict[str, Li
         zones_order=Zones,
         seat_fn=rand_seat_day_constructive,
         seed=rng.randrange(10**9),
+        zone_of=ci.zone_of,
+        workers=workers,
+        seat_kwargs={"gustos_por_zona": pre["gustos_por_zona"]},
     )
     return solucion, groups_days
 
 def randomized_solution_desde_archivo(
-    path_json: str,
+    path_json,
     seed: int | None = None
 ) -> Dict[str, Dict[str, List[Tuple[str, str]]]]:
 
-    with open(path_json, "r", encoding="utf-8") as f:
-        instance = json.load(f)
+    # ruta del JSON o CompiledInstance ya cargada
+    instance = como_instancia(path_json)
 
     if seed is None:
         seed = secrets.randbits(64)  # reproducible si lo guardas/loggeas
@@ -347,4 +445,79 @@ def randomized_solution_desde_archivo(
     # reutiliza tu función existente sin cambiar su lógica
     return randomized_solution(instance, seed=seed)
 
-
+# -----------------------------------------
+# 5) Lote de corridas con élite acotada
+# -----------------------------------------
+def semilla_corrida(seed: int, j: int) -> int:
+    """Semilla de la corrida j: flujos independientes vía SeedSequence([seed, j])."""
+    return int(np.random.SeedSequence([seed, j]).generate_state(1, dtype=np.uint64)[0])
+
+def _agregar_elite(elite: list, k: int, score: Tuple[int, int, int], j: int, item):
+    """Mantiene las k mejores corridas en un heap cuya raíz es la peor (empates: menor j gana)."""
+    clave = (tuple(-x for x in score), -j)
+    if len(elite) < k:
+        heapq.heappush(elite, (clave, item))
+    elif clave > elite[0][0]:
+        heapq.heapreplace(elite, (clave, item))
+
+def _correr_bloque(instance, seed: int, inicio: int, fin: int, k: int, tam_bloque: int) -> Dict:
+    """Corridas inicio..fin-1: élite local y estadísticas (sumas exactas, mínimo y máximo)."""
+    ci = como_instancia(instance)
+    elite: list = []
+    suma = [0, 0, 0]
+    minimo = maximo = None
+    for a in range(inicio, fin, tam_bloque):
+        corridas = []
+        for j in range(a, min(a + tam_bloque, fin)):
+            semilla = semilla_corrida(seed, j)
+            sol, groups_days = randomized_solution(ci, seed=semilla)
+            corridas.append((j, semilla, sol, groups_days))
+        scores = evaluate_batch(apilar_soluciones(ci, [c[2] for c in corridas]), ci).tolist()
+        for (j, semilla, sol, groups_days), score in zip(corridas, scores):
+            score = tuple(score)
+            for c in range(3):
+                suma[c] += score[c]
+            minimo = score if minimo is None or score < minimo else minimo
+            maximo = score if maximo is None or score > maximo else maximo
+            _agregar_elite(elite, k, score, j, (score, j, semilla, sol, groups_days))
+    return {"n": fin - inicio, "suma": suma, "min": minimo, "max": maximo, "elite": elite}
+
+def randomized_batch(instance, n: int, seed: int = 0, workers: int = None, k: int = 10,
+                     tam_bloque: int = 256) -> Dict:
+    """
+    n corridas del constructivo aleatorio sin guardar todas las soluciones.
+    - la corrida j usa semilla_corrida(seed, j): el resultado no depende de workers
+    - se evalúan por bloques con evaluate_batch y solo se conserva la élite (top-k)
+    - con workers > 1 las corridas se reparten en rangos contiguos entre procesos
+    Devuelve {"n", "seed", "media", "min", "max", "elite"}; elite es una lista de dicts
+    (score, corrida, semilla, solucion, groups_days) ordenada de mejor a peor.
+    """
+    ci = como_instancia(instance)
+    if workers and workers > 1 and n > 1:
+        from concurrent.futures import ProcessPoolExecutor
+        cortes = [n * w // workers for w in range(workers + 1)]
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            partes = list(pool.map(_correr_bloque, [ci.raw] * workers, [seed] * workers,
+                                   cortes[:-1], cortes[1:], [k] * workers, [tam_bloque] * workers))
+    else:
+        partes = [_correr_bloque(ci, seed, 0, n, k, tam_bloque)]
+
+    elite: list = []
+    suma = [0, 0, 0]
+    for parte in partes:
+        for c in range(3):
+            suma[c] += parte["suma"][c]
+        for clave, item in parte["elite"]:
+            _agregar_elite(elite, k, item[0], item[1], item)
+    validas = [p for p in partes if p["n"]]
+    return {
+        "n": n,
+        "seed": seed,
+        "media": tuple(x / n for x in suma) if n else None,
+        "min": min((p["min"] for p in validas), default=None),
+        "max": max((p["max"] for p in validas), default=None),
+        "elite": [
+            {"score": score, "corrida": j, "semilla": semilla, "solucion": sol, "groups_days": groups_days}
+            for _, (score, j, semilla, sol, groups_days) in sorted(elite, reverse=True)
+        ],
+    }
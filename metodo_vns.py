@@ -1,11 +1,14 @@
-import copy, random, json
-from score import evaluate_solution
+import copy, random
+from score import evaluate_solution, contadores
+from instancia import como_instancia
+from indices import IndiceOcupacion, IndiceEmpleados
 
 # ============================================
 # FUNCIONES AUXILIARES
 # ============================================
 
-def mutate_solution_vns(sol, days_e, employees_g, group_meeting_days, neighborhood_type, desks_z):
+def mutate_solution_vns(sol, days_e, employees_g, group_meeting_days, neighborhood_type, desks_z, indice=None,
+                        empleados=None):
     """
     Muta la solución según el tipo de vecindario.
     - neighborhood_type = 1 → swap dentro de zona
@@ -13,8 +16,17 @@ def mutate_solution_vns(sol, days_e, employees_g, group_meeting_days, neighborho
     - neighborhood_type = 3 → mover día libre
     - neighborhood_type = 4 → reubicar aislado
     - neighborhood_type = 5 → reasignar zona completa (nuevo)
+    indice: IndiceOcupacion de sol; si se pasa, se actualiza en sitio para que
+    describa la solución devuelta (pasar indice.copy() si se quiere conservar).
+    empleados: IndiceEmpleados de sol (empleado -> (día, zona, slot)); igual que indice,
+    se actualiza en sitio. Todos los vecindarios mueven asignaciones a través de él.
     """
+    contadores["movimientos"] += 1
     new_sol = copy.deepcopy(sol)
+    if indice is None and neighborhood_type >= 3 and desks_z is not None:
+        indice = IndiceOcupacion.desde_solucion(desks_z, new_sol)
+    if empleados is None:
+        empleados = IndiceEmpleados.desde_solucion(new_sol)
  
     def get_group(emp):
         for g, emps in employees_g.items():
@@ -33,8 +45,8 @@ def mutate_solution_vns(sol, days_e, employees_g, group_meeting_days, neighborho
             (desk1, emp1), (desk2, emp2) = new_sol[day][zone][i1], new_sol[day][zone][i2]
             g1, g2 = get_group(emp1), get_group(emp2)
             if day not in (group_meeting_days.get(g1), group_meeting_days.get(g2)):
-                new_sol[day][zone][i1] = (desk1, emp2)
-                new_sol[day][zone][i2] = (desk2, emp1)
+                empleados.poner(new_sol, day, zone, i1, emp2)
+                empleados.poner(new_sol, day, zone, i2, emp1)
  
     # =====================================================
     # Vecindario 2: SWAP ENTRE ZONAS DEL MISMO DÍA
@@ -51,8 +63,8 @@ def mutate_solution_vns(sol, days_e, employees_g, group_meeting_days, neighborho
                 desk2, emp2 = new_sol[day][z2][i2]
                 g1, g2 = get_group(emp1), get_group(emp2)
                 if day not in (group_meeting_days.get(g1), group_meeting_days.get(g2)):
-                    new_sol[day][z1][i1] = (desk1, emp2)
-                    new_sol[day][z2][i2] = (desk2, emp1)
+                    empleados.poner(new_sol, day, z1, i1, emp2)
+                    empleados.poner(new_sol, day, z2, i2, emp1)
  
     # =====================================================
     # Vecindario 3: MOVER DÍA LIBRE (seguro)
@@ -64,10 +76,7 @@ def mutate_solution_vns(sol, days_e, employees_g, group_meeting_days, neighborho
         meeting_day = group_meeting_days.get(g)
 
         # Días donde ya está asignado
-        current_days = [
-            d for d in new_sol.keys()
-            if d != meeting_day and any(emp == e for z in new_sol[d].values() for _, e in z)
-        ]
+        current_days = [d for d in new_sol.keys() if d != meeting_day and empleados.asiste(emp, d)]
         if not current_days:
             return new_sol
 
@@ -91,24 +100,20 @@ def mutate_solution_vns(sol, days_e, employees_g, group_meeting_days, neighborho
         z_from = random.choice(zones_from)
 
         # Buscar el empleado en el día origen
-        idx_emp, desk_emp = None, None
-        for i, (desk, e) in enumerate(new_sol[day_from][z_from]):
-            if e == emp:
-                idx_emp, desk_emp = i, desk
-                break
-        if idx_emp is None:
+        slots = empleados.slots(emp, day_from, z_from)
+        if not slots:
             return new_sol
+        idx_emp = slots[0]
+        desk_emp = new_sol[day_from][z_from][idx_emp][0]
 
         # Buscar espacio disponible o alguien para hacer swap
-        ocupados = [desk for zonas in new_sol[day_to].values() for desk, _ in zonas]
-        libres = [d for d in desks_z[z_to] if d not in ocupados]
-
         moved = False
 
         # 🔹 Caso 1: hay espacio libre → mover directamente
-        if libres:
-            nuevo_desk = random.choice(libres)
-            new_sol[day_to][z_to].append((nuevo_desk, emp))
+        if indice.n_libres(day_to, z_to):
+            nuevo_desk = indice.elegir_libre(day_to, z_to)
+            empleados.agregar(new_sol, day_to, z_to, nuevo_desk, emp)
+            indice.ocupar(day_to, nuevo_desk)
             moved = True
 
         # 🔹 Caso 2: no hay espacio libre → intentar swap
@@ -119,16 +124,15 @@ def mutate_solution_vns(sol, days_e, employees_g, group_meeting_days, neighborho
 
             # Validar que no se viole día de reunión
             if day_to not in (group_meeting_days.get(g), group_meeting_days.get(g2)):
-                new_sol[day_to][z_to][i_target] = (desk_target, emp)
-                new_sol[day_from][z_from][idx_emp] = (desk_emp, emp_target)
+                empleados.poner(new_sol, day_to, z_to, i_target, emp)
+                empleados.poner(new_sol, day_from, z_from, idx_emp, emp_target)
                 moved = True
 
         # 🧩 Solo eliminar del origen si el movimiento fue confirmado
         if moved:
             # eliminar la asignación anterior (si sigue ahí)
-            new_sol[day_from][z_from] = [
-                (d, e) for d, e in new_sol[day_from][z_from] if e != emp
-            ]
+            for d in empleados.quitar_empleado(new_sol, day_from, z_from, emp):
+                indice.liberar(day_from, d)
 
         return new_sol
 
@@ -175,25 +179,16 @@ def mutate_solution_vns(sol, days_e, employees_g, group_meeting_days, neighborho
             return new_sol
 
         # Buscar escritorio actual del aislado
-        desk_from = None
-        for (desk, e) in new_sol[day][zone_from]:
-            if e == emp_iso:
-                desk_from = desk
-                break
-
-        if desk_from is None:
+        if not empleados.slots(emp_iso, day, zone_from):
             return new_sol
 
-        # Calcular escritorios ocupados
-        ocupados = [desk for zonas in new_sol[day].values() for desk, _ in zonas]
-        libres = [d for d in desks_z[best_zone] if d not in ocupados]
-
         moved = False  # bandera para saber si se movió correctamente
 
         # 🔹 Caso 1: hay espacio libre en la zona destino
-        if libres:
-            nuevo_desk = random.choice(libres)
-            new_sol[day][best_zone].append((nuevo_desk, emp_iso))
+        if indice.n_libres(day, best_zone):
+            nuevo_desk = indice.elegir_libre(day, best_zone)
+            empleados.agregar(new_sol, day, best_zone, nuevo_desk, emp_iso)
+            indice.ocupar(day, nuevo_desk)
             moved = True
 
         # 🔹 Caso 2: no hay cupo → intentar hacer swap con alguien del destino
@@ -204,22 +199,16 @@ def mutate_solution_vns(sol, days_e, employees_g, group_meeting_days, neighborho
 
             # Verificar que no sea día de reunión para ninguno de los grupos
             if day not in (group_meeting_days.get(g), group_meeting_days.get(g2)):
-                new_sol[day][best_zone][i_target] = (desk_target, emp_iso)
+                empleados.poner(new_sol, day, best_zone, i_target, emp_iso)
                 moved = True
                 # Insertar al otro empleado en el origen (swap)
-                for i, (desk, e) in enumerate(new_sol[day][zone_from]):
-                    if e == emp_iso:
-                        new_sol[day][zone_from][i] = (desk, emp_target)
-                        break
+                empleados.poner(new_sol, day, zone_from, empleados.slots(emp_iso, day, zone_from)[0], emp_target)
 
         # 🧩 Solo eliminar del origen si el movimiento fue confirmado y no fue swap
         if moved:
             # Si el empleado fue agregado a destino pero no hubo swap, eliminar del origen
-            still_there = any(e == emp_iso for _, e in new_sol[day][zone_from])
-            if still_there:
-                new_sol[day][zone_from] = [
-                    (d, e) for d, e in new_sol[day][zone_from] if e != emp_iso
-                ]
+            for d in empleados.quitar_empleado(new_sol, day, zone_from, emp_iso):
+                indice.liberar(day, d)
 
         return new_sol
 
@@ -248,24 +237,29 @@ def mutate_solution_vns(sol, days_e, employees_g, group_meeting_days, neighborho
         if not emps_grupo:
             return new_sol  # el grupo no está presente este día
  
-        # Calcular escritorios ocupados
-        ocupados = [desk for zonas in new_sol[day].values() for desk, _ in zonas]
         tamaño_grupo = len(emps_grupo)
  
         # Buscar una zona destino con capacidad suficiente
-        zonas_posibles = [z for z in zones if len([d for d in desks_z[z] if d not in ocupados]) >= tamaño_grupo]
+        zonas_posibles = [z for z in zones if indice.n_libres(day, z) >= tamaño_grupo]
         if not zonas_posibles:
             return new_sol
  
         zone_dest = random.choice(zonas_posibles)
+        # escritorios libres de la zona destino (antes de soltar los del grupo)
+        libres = [d for d in desks_z[zone_dest] if indice.esta_libre(day, d)][:tamaño_grupo]
+
         # Quitar grupo de su(s) zona(s)
         for z in zones:
-            new_sol[day][z] = [(desk, emp) for desk, emp in new_sol[day][z] if get_group(emp) != g]
+            slots = [i for i, (_, emp) in enumerate(new_sol[day][z]) if get_group(emp) == g]
+            for i in slots:
+                indice.liberar(day, new_sol[day][z][i][0])
+            for i in reversed(slots):
+                empleados.quitar(new_sol, day, z, i)
  
         # Asignar nuevos escritorios en la zona destino
-        libres = [d for d in desks_z[zone_dest] if d not in ocupados][:tamaño_grupo]
         for d, emp in zip(libres, emps_grupo):
-            new_sol[day][zone_dest].append((d, emp))
+            empleados.agregar(new_sol, day, zone_dest, d, emp)
+            indice.ocupar(day, d)
 
     # =====================================================
     # Vecindario 6: REASIGNAR SEGÚN PREFERENCIAS (seguro)
@@ -282,25 +276,14 @@ def mutate_solution_vns(sol, days_e, employees_g, group_meeting_days, neighborho
             return new_sol
         meeting_day = group_meeting_days.get(g)
 
-        # Encontrar el día actual donde está asignado
-        current_day = None
-        current_zone = None
-        idx_emp = None
-        for d, zonas in new_sol.items():
-            for z_name, z_data in zonas.items():
-                for i, (desk, e) in enumerate(z_data):
-                    if e == emp:
-                        current_day = d
-                        current_zone = z_name
-                        idx_emp = i
-                        break
-                if current_day:
-                    break
-            if current_day:
-                break
-
-        if not current_day:
+        # Encontrar el día actual donde está asignado (el primero en el orden de sol)
+        ubicaciones = empleados.ubicaciones(emp)
+        if not ubicaciones:
             return new_sol  # no encontrado
+        orden_dias = list(new_sol)
+        current_day, current_zone, _ = min(
+            ubicaciones, key=lambda u: (orden_dias.index(u[0]), list(new_sol[u[0]]).index(u[1]), u[2])
+        )
 
         # Si ya está en un día de su preferencia, no hacemos nada
         if current_day in days_e.get(emp, []):
@@ -315,34 +298,20 @@ def mutate_solution_vns(sol, days_e, employees_g, group_meeting_days, neighborho
 
         # Buscar zona destino con cupo
         zonas_dest = list(new_sol[day_to].keys())
-        ocupados = [desk for zonas in new_sol[day_to].values() for desk, _ in zonas]
-        zonas_libres = [
-            z for z in zonas_dest if any(d not in ocupados for d in desks_z[z])
-        ]
+        zonas_libres = indice.zonas_con_libres(day_to, zonas_dest)
         if not zonas_libres:
             return new_sol
 
         zone_to = random.choice(zonas_libres)
-        libres = [d for d in desks_z[zone_to] if d not in ocupados]
-        if not libres:
-            return new_sol
 
         # ✅ Confirmar que existe destino antes de tocar nada
-        nuevo_desk = random.choice(libres)
+        nuevo_desk = indice.elegir_libre(day_to, zone_to)
 
-        # Intentar mover (insertar primero)
-        try:
-            new_sol[day_to][zone_to].append((nuevo_desk, emp))
-            moved = True
-        except Exception:
-            moved = False
-
-        # 🧩 Eliminar solo si el movimiento fue exitoso
-        if moved:
-            # eliminar la asignación antigua
-            new_sol[current_day][current_zone] = [
-                (d, e) for d, e in new_sol[current_day][current_zone] if e != emp
-            ]
+        # Mover: insertar primero y luego eliminar la asignación antigua
+        empleados.agregar(new_sol, day_to, zone_to, nuevo_desk, emp)
+        indice.ocupar(day_to, nuevo_desk)
+        for d in empleados.quitar_empleado(new_sol, current_day, current_zone, emp):
+            indice.liberar(current_day, d)
 
     return new_sol
 
@@ -356,21 +325,30 @@ def local_search_vns(sol_inicial, days_e, employees_g, group_meeting_days, k, de
     Realiza búsqueda local en el vecindario k.
     Genera múltiples mutaciones del mismo tipo (vecindario k)
     hasta que no encuentre mejoras.
+    path_json puede ser la ruta o la CompiledInstance ya cargada (evita releer el JSON).
     """
     sol_actual = copy.deepcopy(sol_inicial)
     score_actual = evaluate_solution(sol_actual, path_json)
+    # la ocupación viaja con la solución: cada vecino parte de una copia del índice
+    indice_actual = IndiceOcupacion.desde_solucion(desk_z, sol_actual) if k >= 3 and desk_z is not None else None
+    empleados_actual = IndiceEmpleados.desde_solucion(sol_actual)
 
     mejora = True
     while mejora:
         mejora = False
         for _ in range(max_intentos):
-            vecino = mutate_solution_vns(sol_actual, days_e, employees_g, group_meeting_days, k, desk_z)
+            indice_vecino = indice_actual.copy() if indice_actual is not None else None
+            empleados_vecino = empleados_actual.copy()
+            vecino = mutate_solution_vns(sol_actual, days_e, employees_g, group_meeting_days, k, desk_z, indice_vecino,
+                                         empleados_vecino)
             score_vecino = evaluate_solution(vecino, path_json)
 
             # Mejora lexicográfica o directa
             if score_vecino < score_actual:
                 sol_actual = vecino
                 score_actual = score_vecino
+                indice_actual = indice_vecino
+                empleados_actual = empleados_vecino
                 mejora = True
                 break  # usamos first-improvement (más eficiente)
 
@@ -390,17 +368,17 @@ def vns_assignments(initial_solution, group_meeting_days, path_json, max_iter=50
       N2: swap entre zonas del mismo día
       N3: mover día libre
     """
-    with open(path_json, "r", encoding="utf-8") as f:
-        instance = json.load(f)
+    # path_json: ruta del JSON o CompiledInstance ya cargada
+    instance = como_instancia(path_json)
 
-    days_e = instance["Days_E"]
-    employees_g = instance["Employees_G"]
-    desks_z = instance["Desks_Z"]
+    days_e = instance.days_e
+    employees_g = instance.employees_g
+    desks_z = instance.desks_z
 
     current_solution = copy.deepcopy(initial_solution)
     best_solution = copy.deepcopy(initial_solution)
 
-    current_score = evaluate_solution(current_solution, path_json)
+    current_score = evaluate_solution(current_solution, instance)
     best_score = current_score
 
     vecindarios = [1, 2, 3, 4, 5, 6]
@@ -418,7 +396,7 @@ def vns_assignments(initial_solution, group_meeting_days, path_json, max_iter=50
 
             # BÚSQUEDA LOCAL — mejora dentro del mismo vecindario
             neighbor, neighbor_score = local_search_vns(
-                neighbor, days_e, employees_g, group_meeting_days, k, desks_z, path_json
+                neighbor, days_e, employees_g, group_meeting_days, k, desks_z, instance
             )
 
             # EVALUACIÓN Y ACTUALIZACIÓN
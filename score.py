@@ -1,4 +1,10 @@
-import json
+from collections import Counter
+import numpy as np
+from instancia import como_instancia
+
+# contadores globales (los lee benchmark.py): evaluaciones completas o incrementales
+# y movimientos propuestos por las búsquedas
+contadores = Counter()
 
 def _emp_to_group(employees_g):
     return {e: g for g, es in employees_g.items() for e in es}
@@ -36,17 +42,82 @@ def calculate_isolated_employee(sol, employees_g):
                     violations += 1
     return violations
 
-def evaluate_solution(sol, archivo_json: str):
-    """Evalúa la solución cargando la instancia directamente desde archivo."""
-    with open(archivo_json, "r", encoding="utf-8") as f:
-        instance = json.load(f)
+def count_isolated_employees(sol, emp_to_group):
+    """
+    Igual que calculate_isolated_employee pero lineal: una pasada por zona contando
+    empleados por grupo; aislados = grupos con exactamente un empleado en la zona.
+    Recibe el mapa emp->grupo ya construido.
+    """
+    violations = 0
+    for _, zones in sol.items():
+        for _, assignments in zones.items():
+            counts = Counter(emp_to_group.get(emp) for _, emp in assignments)
+            counts.pop(None, None)   # robustez: ignora empleados sin grupo
+            violations += sum(1 for c in counts.values() if c == 1)
+    return violations
+
+def count_isolated_employees_batch(solutions, employees_g):
+    """Aislados de muchas soluciones a la vez, construyendo emp->grupo una sola vez."""
+    emp_to_group = _emp_to_group(employees_g)
+    return [count_isolated_employees(sol, emp_to_group) for sol in solutions]
 
-    desks_e = instance["Desks_E"]
-    days_e = instance["Days_E"]
-    employees_g = instance["Employees_G"]
+def evaluate_solution(sol, archivo_json):
+    """
+    Evalúa la solución. Acepta una CompiledInstance ya cargada (lo recomendado en
+    bucles), el dict de la instancia o la ruta del JSON. El mismo objeto dict se
+    compila una sola vez; las rutas pasan por un cache que solo vuelve a leer el
+    archivo si cambia su mtime o tamaño.
+    """
+    instance = como_instancia(archivo_json)
+    contadores["evaluaciones"] += 1
+
+    desks_e = instance.desks_e_set
+    days_e = instance.days_e_set
+    emp_to_group = instance.emp_to_group
 
     return (
-        calculate_valid_assignments(sol, desks_e),     # prioridad 1
-        calculate_employee_preferences(sol, days_e),   # prioridad 2
-        calculate_isolated_employee(sol, employees_g)  # prioridad 3
+        calculate_valid_assignments(sol, desks_e),       # prioridad 1
+        calculate_employee_preferences(sol, days_e),     # prioridad 2
+        count_isolated_employees(sol, emp_to_group)      # prioridad 3
     )
+
+# límite de celdas (solución, día, zona, grupo) para contar con bincount denso
+_MAX_CELDAS_DENSAS = 1 << 25
+
+def evaluate_batch(solutions_array, compiled_instance):
+    """
+    Evalúa muchas soluciones a la vez con NumPy.
+    solutions_array: arreglo (N, días, escritorios) de ocupantes (ids de empleado, -1 = libre),
+    p. ej. np.stack([SolucionArray.ocupante, ...]).
+    Devuelve un arreglo (N, 3) con (inválidas, preferencias, aislados) por solución.
+    """
+    ci = como_instancia(compiled_instance)
+    occ = np.asarray(solutions_array)
+    if occ.ndim == 2:
+        occ = occ[None]
+    n, n_days, _ = occ.shape
+    out = np.zeros((n, 3), dtype=np.int64)
+    contadores["evaluaciones"] += n
+    if n == 0:
+        return out
+
+    s_idx, t_idx, d_idx = np.nonzero(occ >= 0)
+    e_idx = occ[s_idx, t_idx, d_idx]
+
+    out[:, 0] = np.bincount(s_idx, weights=~ci.desk_pref[e_idx, d_idx], minlength=n)   # prioridad 1
+    out[:, 1] = np.bincount(s_idx, weights=~ci.day_pref[e_idx, t_idx], minlength=n)    # prioridad 2
+
+    # prioridad 3: celdas (solución, día, zona, grupo) con exactamente un empleado
+    g_idx = ci.emp_group[e_idx]
+    con_grupo = g_idx >= 0   # robustez: ignora empleados sin grupo
+    n_z, n_g = ci.n_zones, max(ci.n_groups, 1)
+    celdas = ((s_idx[con_grupo].astype(np.int64) * n_days + t_idx[con_grupo]) * n_z
+              + ci.desk_zone[d_idx[con_grupo]]) * n_g + g_idx[con_grupo]
+    por_sol = n_days * n_z * n_g
+    if n * por_sol <= _MAX_CELDAS_DENSAS:
+        conteo = np.bincount(celdas, minlength=n * por_sol).reshape(n, por_sol)
+        out[:, 2] = (conteo == 1).sum(axis=1)
+    else:
+        unicas, conteo = np.unique(celdas, return_counts=True)
+        out[:, 2] = np.bincount(unicas[conteo == 1] // por_sol, minlength=n)
+    return out
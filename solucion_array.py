@@ -0,0 +1,160 @@
+from typing import Dict, Iterable, List, Tuple
+
+import numpy as np
+
+from instancia import CompiledInstance, como_instancia
+
+LIBRE = -1   # escritorio sin ocupante / empleado que no asiste ese día
+
+# cambios de un movimiento: (quitar, poner) como listas de (día, escritorio, empleado),
+# el mismo formato que consume EvaluadorIncremental
+Cambios = Tuple[List[Tuple[int, int, int]], List[Tuple[int, int, int]]]
+
+
+# =========================
+# Solución sobre arreglos
+# =========================
+class SolucionArray:
+    """
+    Solución compacta:
+    - ocupante[día, escritorio] = id del empleado (LIBRE si está vacío)
+    - escritorio[empleado, día] = id del escritorio (LIBRE si no asiste)
+    Los movimientos se aplican en sitio y quedan en un log para poder deshacerlos;
+    copiar es un par de ndarray.copy().
+    """
+
+    def __init__(self, ci: CompiledInstance, ocupante: np.ndarray = None, escritorio: np.ndarray = None):
+        self.ci = ci
+        if ocupante is None:
+            ocupante = np.full((ci.n_days, ci.n_desks), LIBRE, dtype=np.int32)
+        if escritorio is None:
+            escritorio = np.full((ci.n_employees, ci.n_days), LIBRE, dtype=np.int32)
+            for t, d in zip(*np.nonzero(ocupante >= 0)):
+                escritorio[ocupante[t, d], t] = d
+        self.ocupante = ocupante
+        self.escritorio = escritorio
+        self._log: List[Tuple[int, int, int]] = []   # (día, escritorio, ocupante anterior)
+
+    # -------------------------
+    # Adaptadores formato dict
+    # -------------------------
+    @classmethod
+    def desde_dict(cls, instance, sol: Dict[str, Dict[str, List[Tuple[str, str]]]]) -> "SolucionArray":
+        ci = como_instancia(instance)
+        out = cls(ci)
+        for t, d, e in ci.solucion_a_asignaciones(sol).tolist():
+            if out.ocupante[t, d] != LIBRE or out.escritorio[e, t] != LIBRE:
+                raise ValueError(
+                    f"Solución no representable: escritorio {ci.desks[d]} o empleado "
+                    f"{ci.employees[e]} repetido el día {ci.days[t]}"
+                )
+            out.ocupante[t, d] = e
+            out.escritorio[e, t] = d
+        return out
+
+    def a_dict(self) -> Dict[str, Dict[str, List[Tuple[str, str]]]]:
+        return self.ci.asignaciones_a_solucion(self.asignaciones())
+
+    def asignaciones(self) -> List[Tuple[int, int, int]]:
+        """Lista de (día, escritorio, empleado) ocupados."""
+        t, d = np.nonzero(self.ocupante >= 0)
+        return list(zip(t.tolist(), d.tolist(), self.ocupante[t, d].tolist()))
+
+    def copy(self) -> "SolucionArray":
+        return SolucionArray(self.ci, self.ocupante.copy(), self.escritorio.copy())
+
+    # -------------------------
+    # Consultas
+    # -------------------------
+    def dias_de(self, e: int) -> List[int]:
+        return np.flatnonzero(self.escritorio[e] >= 0).tolist()
+
+    def asiste(self, e: int, t: int) -> bool:
+        return self.escritorio[e, t] != LIBRE
+
+    def libres(self, t: int, z: int = None) -> np.ndarray:
+        """Escritorios libres del día t (opcionalmente solo de la zona z)."""
+        desks = self.ci.zone_desks[z] if z is not None else np.arange(self.ci.n_desks)
+        return desks[self.ocupante[t, desks] == LIBRE]
+
+    # -------------------------
+    # Movimientos en sitio
+    # -------------------------
+    def _set(self, t: int, d: int, e: int):
+        prev = int(self.ocupante[t, d])
+        if prev != LIBRE:
+            self.escritorio[prev, t] = LIBRE
+        self.ocupante[t, d] = e
+        if e != LIBRE:
+            self.escritorio[e, t] = d
+        return prev
+
+    def _poner(self, t: int, d: int, e: int):
+        self._log.append((t, d, self._set(t, d, e)))
+
+    def mover(self, e: int, t_from: int, t_to: int, d_to: int) -> Cambios:
+        """Mueve al empleado e de su escritorio del día t_from al escritorio libre d_to del día t_to."""
+        d_from = int(self.escritorio[e, t_from])
+        if d_from == LIBRE:
+            raise ValueError("el empleado no asiste el día de origen")
+        if self.ocupante[t_to, d_to] != LIBRE:
+            raise ValueError("el escritorio destino está ocupado")
+        if t_to != t_from and self.escritorio[e, t_to] != LIBRE:
+            raise ValueError("el empleado ya asiste el día destino")
+        self._poner(t_from, d_from, LIBRE)
+        self._poner(t_to, d_to, e)
+        return [(t_from, d_from, e)], [(t_to, d_to, e)]
+
+    def intercambiar(self, t1: int, d1: int, t2: int, d2: int) -> Cambios:
+        """Los ocupantes de (t1, d1) y (t2, d2) intercambian lugar."""
+        e1, e2 = int(self.ocupante[t1, d1]), int(self.ocupante[t2, d2])
+        if t1 != t2 and ((e1 != LIBRE and self.escritorio[e1, t2] != LIBRE) or
+                         (e2 != LIBRE and self.escritorio[e2, t1] != LIBRE)):
+            raise ValueError("el intercambio repetiría un empleado en un día")
+        self._poner(t1, d1, LIBRE)
+        self._poner(t2, d2, LIBRE)
+        self._poner(t1, d1, e2)
+        self._poner(t2, d2, e1)
+        quitar = [(t, d, e) for t, d, e in ((t1, d1, e1), (t2, d2, e2)) if e != LIBRE]
+        poner = [(t, d, e) for t, d, e in ((t1, d1, e2), (t2, d2, e1)) if e != LIBRE]
+        return quitar, poner
+
+    def reubicar(self, t: int, movimientos: Iterable[Tuple[int, int]]) -> Cambios:
+        """Reubica empleados dentro del día t: movimientos = [(empleado, escritorio_destino)]."""
+        movimientos = [(e, int(self.escritorio[e, t]), d) for e, d in movimientos]
+        liberados = {d0 for _, d0, _ in movimientos}
+        if any(self.ocupante[t, d1] != LIBRE and d1 not in liberados for _, _, d1 in movimientos):
+            raise ValueError("el escritorio destino está ocupado")
+        for e, d0, _ in movimientos:
+            self._poner(t, d0, LIBRE)
+        for e, _, d1 in movimientos:
+            self._poner(t, d1, e)
+        return [(t, d0, e) for e, d0, _ in movimientos], [(t, d1, e) for e, _, d1 in movimientos]
+
+    # -------------------------
+    # Log de deshacer
+    # -------------------------
+    def marca(self) -> int:
+        return len(self._log)
+
+    def deshacer(self, marca: int = 0):
+        """Revierte todos los movimientos posteriores a la marca."""
+        while len(self._log) > marca:
+            t, d, prev = self._log.pop()
+            self._set(t, d, prev)
+
+    def confirmar(self):
+        """Acepta los movimientos aplicados y vacía el log."""
+        self._log.clear()
+
+
+def apilar_soluciones(instance, soluciones) -> np.ndarray:
+    """Apila soluciones (formato dict o SolucionArray) en un arreglo (N, días, escritorios) de ocupantes."""
+    ci = como_instancia(instance)
+    capas = [
+        s.ocupante if isinstance(s, SolucionArray) else SolucionArray.desde_dict(ci, s).ocupante
+        for s in soluciones
+    ]
+    if not capas:
+        return np.empty((0, ci.n_days, ci.n_desks), dtype=np.int32)
+    return np.stack(capas)
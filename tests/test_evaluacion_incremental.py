@@ -0,0 +1,14 @@
+import os
+
+import pytest
+
+from evaluacion_incremental import verificar_equivalencia
+
+INSTANCIAS = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "instances")
+
+
+@pytest.mark.parametrize("n", [1, 7, 10])
+def test_delta_igual_a_evaluate_solution(n):
+    """Movimientos aleatorios (semilla fija): el puntaje incremental coincide con score.py en cada paso."""
+    path = os.path.join(INSTANCIAS, f"instance{n}.json")
+    assert verificar_equivalencia(path, n_movimientos=1000, seed=n) == 1000